@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from . import controllers
 from . import models
 from . import wizards
 from .models.system_settings import post_init_hook
\ No newline at end of file
@@ -1,6 +1,6 @@
 {
     'name': 'Alromaih Cars Dashboard',
-    'version': '18.0.3.6.0',
+    'version': '18.0.3.7.0',
     'summary': 'Alromaih Cars Management Dashboard',
     'description': """
         Alromaih Cars Dashboard Module
@@ -28,6 +28,7 @@
         'base',
         'web',
         'mail',
+        'bus',
         'product',
         'alromaih_cars_inventory',
         'crm',
@@ -40,6 +41,7 @@
         'data/iframe_dashboard_data.xml',
         'data/system_parameters.xml',
         'data/system_settings_default.xml',
+        'data/ir_cron_data.xml',
         
         # Views - Actions must be defined before menus that reference them
         'views/car_views.xml',
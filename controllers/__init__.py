@@ -1,7 +1,5 @@
 # -*- coding: utf-8 -*-
 # Controllers for Alromaih Cars Dashboard
- 
-# Future controller imports will go here
-# Example:
-# from . import main
-# from . import api 
\ No newline at end of file
+
+from . import api
+from . import main
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+
+from odoo import api, http
+from odoo.exceptions import ValidationError
+from odoo.http import request
+from odoo.modules.registry import Registry
+from odoo.tools import date_utils
+
+_logger = logging.getLogger(__name__)
+
+# Fields each endpoint may return (?fields=a,b,c) and the default selection
+API_FIELDS = {
+    'alromaih.car': {
+        'allowed': {
+            'id', 'name', 'seo_url_slug', 'description', 'brand_id', 'model_id', 'trim_id', 'year_id',
+            'cash_price', 'vat_percentage', 'cash_price_with_vat', 'finance_price', 'has_active_offer',
+            'is_featured', 'status', 'primary_variant_id', 'primary_color_id', 'color_ids',
+            'meta_title', 'meta_description', 'meta_keywords', 'total_specifications',
+            'specification_completion', 'write_date',
+        },
+        'default': [
+            'id', 'name', 'seo_url_slug', 'brand_id', 'model_id', 'year_id',
+            'cash_price_with_vat', 'has_active_offer', 'is_featured',
+        ],
+    },
+    'alromaih.car.variant': {
+        'allowed': {
+            'id', 'name', 'seo_url_slug', 'car_id', 'color_id', 'price', 'offer_price', 'has_offer',
+            'active_offer_id', 'is_primary', 'stock_status', 'qty_available', 'media_count',
+            'meta_title', 'meta_description', 'write_date',
+        },
+        'default': ['id', 'name', 'car_id', 'color_id', 'price', 'offer_price', 'has_offer', 'is_primary'],
+    },
+    'alromaih.car.offer': {
+        'allowed': {
+            'id', 'name', 'description', 'car_id', 'car_variant_id', 'start_date', 'end_date',
+            'discount_type', 'discount_value', 'original_price', 'final_price', 'is_active',
+            'offer_tag', 'banner_url', 'write_date',
+        },
+        'default': [
+            'id', 'name', 'car_id', 'car_variant_id', 'start_date', 'end_date',
+            'discount_type', 'discount_value', 'final_price', 'offer_tag',
+        ],
+    },
+}
+
+# Records whose changes alter a model's prices without touching its write_date:
+# (related model, field linking it to the listed records)
+ETAG_DEPENDENCIES = {
+    'alromaih.car': [('alromaih.car.offer', 'car_id'), ('alromaih.car.variant.price', 'car_id')],
+    'alromaih.car.variant': [('alromaih.car.offer', 'car_variant_id'), ('alromaih.car.variant.price', 'variant_id')],
+}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+EXPORT_CHUNK_SIZE = 200
+
+
+class CarCatalogApi(http.Controller):
+    """Read-only JSON catalog API for the website and Next.js frontend"""
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _is_public_user(self):
+        return request.env.user._is_public()
+
+    def _get_model(self, model_name):
+        """Public users read through sudo, restricted by _get_visibility_domain"""
+        model = request.env[model_name]
+        return model.sudo() if self._is_public_user() else model
+
+    def _get_visibility_domain(self, model_name):
+        """Public users only see published cars and what belongs to them"""
+        if not self._is_public_user():
+            return []
+        if model_name == 'alromaih.car':
+            return [('status', '=', 'published')]
+        if model_name == 'alromaih.car.variant':
+            return [('car_id.status', '=', 'published')]
+        return [('is_active', '=', True), ('car_id.status', '=', 'published')]
+
+    def _parse_fields(self, model_name, fields_param):
+        config = API_FIELDS[model_name]
+        if not fields_param:
+            return list(config['default'])
+        requested = [name.strip() for name in fields_param.split(',') if name.strip()]
+        selected = [name for name in requested if name in config['allowed']]
+        if 'id' not in selected:
+            selected.insert(0, 'id')
+        return selected
+
+    def _parse_int(self, value, default=None):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def _parse_int_params(self, kwargs, names):
+        """{name: int} for the given query parameters that are set; ValueError names an invalid one"""
+        values = {}
+        for name in names:
+            if kwargs.get(name):
+                value = self._parse_int(kwargs[name])
+                if value is None:
+                    raise ValueError(f"Parameter '{name}' must be an integer")
+                values[name] = value
+        return values
+
+    def _compute_etag(self, model_name, records, field_names):
+        """Weak validator from the page's ids, latest write_date (including the offers and
+        effective prices of the records), fields and language"""
+        write_dates = []
+        if records:
+            [(max_write_date,)] = records._read_group([('id', 'in', records.ids)], [], ['write_date:max'])
+            write_dates.append(max_write_date)
+            for related_model, link_field in ETAG_DEPENDENCIES.get(model_name, []):
+                related = request.env[related_model].sudo().with_context(active_test=False)
+                [(max_write_date,)] = related._read_group([(link_field, 'in', records.ids)], [], ['write_date:max'])
+                write_dates.append(max_write_date)
+        fingerprint = '|'.join([
+            model_name,
+            ','.join(map(str, records.ids)),
+            ','.join(map(str, write_dates)),
+            ','.join(field_names),
+            request.env.lang or '',
+        ])
+        return 'W/"%s"' % hashlib.sha1(fingerprint.encode()).hexdigest()
+
+    def _is_not_modified(self, etag):
+        if_none_match = request.httprequest.headers.get('If-None-Match', '')
+        return etag in [tag.strip() for tag in if_none_match.split(',')]
+
+    def _serialize(self, records, field_names):
+        """read() the selected fields, turning many2one pairs into {id, name} objects"""
+        rows = records.read(field_names)
+        for row in rows:
+            for name in field_names:
+                value = row.get(name)
+                if isinstance(value, tuple) and len(value) == 2:
+                    row[name] = {'id': value[0], 'name': value[1]}
+        return rows
+
+    def _cached_response(self, etag, build_payload):
+        """304 when the client's ETag still matches, otherwise serialize the payload"""
+        headers = [('ETag', etag), ('Cache-Control', 'no-cache')]
+        if self._is_not_modified(etag):
+            return request.make_response('', headers=headers, status=304)
+        return request.make_json_response(build_payload(), headers=dict(headers))
+
+    def _error_response(self, message, status):
+        return request.make_json_response({'error': message}, status=status)
+
+    def _list(self, model_name, domain, kwargs):
+        """Keyset-paginated listing: ?after=<last id>&limit=<n>&fields=a,b"""
+        limit = min(max(self._parse_int(kwargs.get('limit'), DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+        try:
+            after = self._parse_int_params(kwargs, ['after']).get('after', 0)
+        except ValueError as e:
+            return self._error_response(str(e), 400)
+        field_names = self._parse_fields(model_name, kwargs.get('fields'))
+
+        model = self._get_model(model_name)
+        domain = domain + self._get_visibility_domain(model_name) + [('id', '>', after)]
+        records = model.search(domain, limit=limit + 1, order='id')
+        has_more = len(records) > limit
+        records = records[:limit]
+
+        etag = self._compute_etag(model_name, records, field_names)
+        return self._cached_response(etag, lambda: {
+            'data': self._serialize(records, field_names),
+            'next_cursor': records[-1].id if has_more else None,
+            'has_more': has_more,
+        })
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    @http.route('/api/cars', type='http', auth='public', methods=['GET'], csrf=False)
+    def list_cars(self, **kwargs):
+        try:
+            filters = self._parse_int_params(kwargs, ['brand_id', 'model_id'])
+        except ValueError as e:
+            return self._error_response(str(e), 400)
+        domain = [(name, '=', value) for name, value in filters.items()]
+        if kwargs.get('featured') in ('1', 'true'):
+            domain.append(('is_featured', '=', True))
+        return self._list('alromaih.car', domain, kwargs)
+
+    @http.route('/api/cars/<string:slug>', type='http', auth='public', methods=['GET'], csrf=False)
+    def get_car(self, slug, **kwargs):
+        model_name = 'alromaih.car'
+        field_names = self._parse_fields(model_name, kwargs.get('fields'))
+        car = self._get_model(model_name).search(
+            [('seo_url_slug', '=', slug)] + self._get_visibility_domain(model_name), limit=1)
+        if not car:
+            return self._error_response('Car not found', 404)
+
+        etag = self._compute_etag(model_name, car, field_names)
+        return self._cached_response(etag, lambda: {'data': self._serialize(car, field_names)[0]})
+
+    @http.route('/api/variants', type='http', auth='public', methods=['GET'], csrf=False)
+    def list_variants(self, **kwargs):
+        try:
+            filters = self._parse_int_params(kwargs, ['car_id'])
+        except ValueError as e:
+            return self._error_response(str(e), 400)
+        domain = [(name, '=', value) for name, value in filters.items()]
+        if kwargs.get('has_offer') in ('1', 'true'):
+            domain.append(('has_offer', '=', True))
+        return self._list('alromaih.car.variant', domain, kwargs)
+
+    @http.route('/api/offers', type='http', auth='public', methods=['GET'], csrf=False)
+    def list_offers(self, **kwargs):
+        try:
+            filters = self._parse_int_params(kwargs, ['car_id'])
+        except ValueError as e:
+            return self._error_response(str(e), 400)
+        domain = [(name, '=', value) for name, value in filters.items()]
+        if kwargs.get('active') in ('1', 'true'):
+            domain.append(('is_active', '=', True))
+        return self._list('alromaih.car.offer', domain, kwargs)
+
+    @http.route('/api/catalog/export', type='http', auth='user', methods=['GET'], csrf=False)
+    def export_catalog(self, **kwargs):
+        """Stream the whole catalog as NDJSON, one car per line.
+
+        The response outlives the request cursor, so the generator opens its own
+        cursor and reads cars in id-ordered chunks, clearing the cache after each
+        chunk to keep memory flat.
+        """
+        dbname = request.db
+        uid = request.env.uid
+        context = dict(request.env.context)
+        chunk_size = min(max(self._parse_int(kwargs.get('chunk_size'), EXPORT_CHUNK_SIZE), 1), 1000)
+        domain = []
+        if kwargs.get('status'):
+            domain.append(('status', '=', kwargs['status']))
+
+        def generate():
+            with Registry(dbname).cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                Car = env['alromaih.car']
+                last_id = 0
+                while True:
+                    cars = Car.search(domain + [('id', '>', last_id)], order='id', limit=chunk_size)
+                    if not cars:
+                        break
+                    last_id = cars[-1].id
+                    lines = [
+                        json.dumps(row, default=date_utils.json_default, ensure_ascii=False)
+                        for row in cars._get_catalog_export_rows()
+                    ]
+                    env.invalidate_all()
+                    yield ('\n'.join(lines) + '\n').encode()
+
+        return request.make_response(generate(), headers=[
+            ('Content-Type', 'application/x-ndjson; charset=utf-8'),
+            ('Content-Disposition', 'attachment; filename="catalog.ndjson"'),
+            ('Cache-Control', 'no-store'),
+            ('X-Accel-Buffering', 'no'),
+        ])
+
+    @http.route('/api/changes', type='http', auth='user', methods=['GET'], csrf=False)
+    def list_changes(self, **kwargs):
+        """Delta sync: records created, updated or deleted after ?cursor=<opaque cursor>"""
+        limit = min(max(self._parse_int(kwargs.get('limit'), 500), 1), 2000)
+        try:
+            changes = request.env['alromaih.catalog.tombstone'].get_changes(kwargs.get('cursor'), limit=limit)
+        except ValidationError as e:
+            return self._error_response(str(e), 400)
+        return request.make_json_response(changes, headers={'Cache-Control': 'no-store'})
+
+    @http.route('/api/search', type='http', auth='public', methods=['GET'], csrf=False)
+    def search(self, q='', **kwargs):
+        """Ranked full-text search over cars, variants, news and blog posts: ?q=&lang=&types="""
+        search_models = {
+            'cars': 'alromaih.car',
+            'variants': 'alromaih.car.variant',
+            'news': 'alromaih.news',
+            'blog': 'alromaih.blog',
+        }
+        types = [name.strip() for name in kwargs.get('types', '').split(',') if name.strip() in search_models]
+        limit = min(max(self._parse_int(kwargs.get('limit'), 20), 1), 100)
+        results = request.env['alromaih.search.document'].sudo().search_documents(
+            q,
+            lang=kwargs.get('lang') or request.env.lang,
+            model_names=[search_models[name] for name in types] or None,
+            public_only=self._is_public_user(),
+            limit=limit,
+            offset=max(self._parse_int(kwargs.get('offset'), 0), 0),
+        )
+        return request.make_json_response(results)
+
+    @http.route('/api/settings/public', type='http', auth='public', methods=['GET'], csrf=False)
+    def public_settings(self, **kwargs):
+        """Public site settings and asset URLs, served from the in-memory settings document"""
+        settings = request.env['alromaih.system.settings'].sudo()
+        lang = kwargs.get('lang')
+        if lang and lang in dict(request.env['res.lang'].get_installed()):
+            settings = settings.with_context(lang=lang)
+        document = settings._get_public_settings_document()
+        headers = [
+            ('ETag', document['etag']),
+            ('Cache-Control', 'public, max-age=%d' % document['max_age']),
+            ('Vary', 'Accept-Language'),
+        ]
+        if self._is_not_modified(document['etag']):
+            return request.make_response('', headers=headers, status=304)
+        return request.make_response(document['body'], headers=headers + [
+            ('Content-Type', 'application/json; charset=utf-8'),
+        ])
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from odoo import http
+from odoo.http import request
+
+
+class AlromaihSitemapController(http.Controller):
+    """XML sitemaps for cars, news, blog posts and blog categories"""
+
+    def _xml_response(self, content):
+        return request.make_response(content, headers=[
+            ('Content-Type', 'application/xml; charset=utf-8'),
+            ('Cache-Control', 'public, max-age=3600'),
+        ])
+
+    @http.route('/alromaih/sitemap.xml', type='http', auth='public', methods=['GET'], csrf=False)
+    def sitemap_index(self, **kwargs):
+        return self._xml_response(request.env['alromaih.sitemap'].sudo().get_sitemap_index())
+
+    @http.route('/alromaih/sitemap-<string:source>-<int:index>.xml', type='http', auth='public',
+                methods=['GET'], csrf=False)
+    def sitemap_chunk(self, source, index, **kwargs):
+        content = request.env['alromaih.sitemap'].sudo().get_sitemap_chunk(source, index)
+        if content is None:
+            return request.not_found()
+        return self._xml_response(content)
@@ -0,0 +1,17 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Parameters that used to mirror the settings images and derived or internal values
+OBSOLETE_PARAM_FIELDS = [
+    'logo_arabic', 'logo_english', 'website_favicon', 'app_logo', 'app_splash_screen',
+    'logo_arabic_cdn_url', 'logo_english_cdn_url', 'website_favicon_cdn_url',
+    'app_logo_cdn_url', 'app_splash_screen_cdn_url', 'icon_derivative_paths',
+]
+
+
+def migrate(cr, version):
+    """Purge base64 image blobs and computed values mirrored into ir.config_parameter"""
+    keys = [f'alromaih_cars_dash.{field_name}' for field_name in OBSOLETE_PARAM_FIELDS]
+    cr.execute("DELETE FROM ir_config_parameter WHERE key = ANY(%s)", [keys])
+    _logger.info("Removed %d obsolete settings parameters", cr.rowcount)
@@ -0,0 +1,15 @@
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Index the cars, variants, news and blog posts that existed before the search index"""
+    cr.execute("SELECT 1 FROM alromaih_search_document LIMIT 1")
+    if cr.fetchone():
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['alromaih.search.document'].action_rebuild_search_index()
+    _logger.info("Search index backfilled")
@@ -1,9 +1,15 @@
+# Shared mixins
+from . import search_document
+from . import dashboard_bus
+from . import slug_mixin
 # Core car models
 from . import car
 from . import car_variant
 from . import car_offers
+from . import car_variant_price
 from . import car_media
 from . import car_specification_template
+from . import car_spec_facet
 from . import system_settings
 from . import car_brand
 from . import car_model
@@ -15,6 +21,9 @@ from . import alromaih_blog
 from . import alromaih_blog_category
 from . import alromaih_news
 from . import iframe_dashboard
+from . import catalog_tombstone
+from . import sitemap
+from . import crm_lead
 
 try:
     from odoo.addons.alromaih_cars_inventory.models.inventory_models import product_attribute_category
@@ -10,10 +10,16 @@ _logger = logging.getLogger(__name__)
 class AlromaihBlog(models.Model):
     _name = 'alromaih.blog'
     _description = _('Alromaih Blog')
-    _inherit = ['mail.thread', 'mail.activity.mixin', 'website.seo.metadata', 'website.published.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'website.seo.metadata', 'website.published.mixin',
+                'alromaih.search.mixin', 'alromaih.slug.mixin']
     _rec_name = 'title'
     _order = 'publish_date desc, create_date desc'
     
+    # Full-text search index
+    _search_title_field = 'title'
+    _search_body_fields = ['subtitle', 'excerpt', 'content']
+    _search_slug_field = 'slug'
+    
     # Basic Information
     title = fields.Char(string='Blog Title', required=True, translate=True, tracking=True)
     subtitle = fields.Char(string='Subtitle', translate=True)
@@ -128,27 +134,35 @@ class AlromaihBlog(models.Model):
         for blog in self:
             blog.comment_count = len(blog.comment_ids.filtered(lambda c: c.status == 'approved'))
     
-    @api.model
-    def create(self, vals):
-        """Enhanced create with slug generation"""
-        if not vals.get('slug') and vals.get('title'):
-            vals['slug'] = self._generate_slug(vals['title'])
-        
-        if vals.get('status') == 'published' and not vals.get('publish_date'):
-            vals['publish_date'] = fields.Datetime.now()
-        
-        # Auto-generate SEO fields
-        if not vals.get('seo_title') and vals.get('title'):
-            vals['seo_title'] = vals['title'][:60]
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Enhanced create with batched slug generation"""
+        self._fill_missing_slugs(vals_list, 'title')
         
-        if not vals.get('seo_description') and vals.get('excerpt'):
-            vals['seo_description'] = vals['excerpt'][:160]
+        for vals in vals_list:
+            if vals.get('status') == 'published' and not vals.get('publish_date'):
+                vals['publish_date'] = fields.Datetime.now()
+            
+            # Auto-generate SEO fields
+            if not vals.get('seo_title') and vals.get('title'):
+                vals['seo_title'] = vals['title'][:60]
+            
+            if not vals.get('seo_description') and vals.get('excerpt'):
+                vals['seo_description'] = vals['excerpt'][:160]
         
-        return super().create(vals)
+        return super().create(vals_list)
+    
+    def _is_search_public(self):
+        return set(self.filtered('is_published').ids)
+    
+    def _get_search_visibility_fields(self):
+        return ['active', 'status', 'is_published', 'website_published']
     
     def write(self, vals):
         """Enhanced write with slug and status handling"""
         if 'title' in vals and not vals.get('slug'):
+            if len(self) > 1:
+                return self._write_with_unique_slugs(vals, 'title')
             vals['slug'] = self._generate_slug(vals['title'])
         
         if vals.get('status') == 'published' and not self.publish_date:
@@ -156,24 +170,6 @@ class AlromaihBlog(models.Model):
         
         return super().write(vals)
     
-    def _generate_slug(self, title):
-        """Generate URL-friendly slug"""
-        import re
-        if not title:
-            return ''
-        
-        slug = re.sub(r'[^\w\s-]', '', title.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        # Ensure uniqueness
-        original_slug = slug
-        counter = 1
-        while self.search([('slug', '=', slug), ('id', '!=', self.id)]):
-            slug = f"{original_slug}-{counter}"
-            counter += 1
-        
-        return slug
-    
     def action_publish(self):
         """Publish the blog"""
         for blog in self:
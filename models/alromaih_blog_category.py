@@ -1,5 +1,4 @@
 from odoo import api, fields, models, _
-import re
 import logging
 from odoo.exceptions import ValidationError
 
@@ -9,7 +8,7 @@ _logger = logging.getLogger(__name__)
 class AlromaihBlogCategory(models.Model):
     _name = 'alromaih.blog.category'
     _description = _('Blog Category')
-    _inherit = ['mail.thread', 'mail.activity.mixin', 'website.seo.metadata']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'website.seo.metadata', 'alromaih.slug.mixin']
     _rec_name = 'name'
     _order = 'parent_path, sequence, name'
     _parent_name = 'parent_id'
@@ -58,46 +57,30 @@ class AlromaihBlogCategory(models.Model):
         for category in self:
             category.blog_count = len(category.blog_ids.filtered(lambda p: p.status == 'published'))
     
-    @api.model
-    def create(self, vals):
-        """Enhanced create with slug generation"""
-        if not vals.get('slug') and vals.get('name'):
-            vals['slug'] = self._generate_slug(vals['name'])
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Enhanced create with batched slug generation"""
+        self._fill_missing_slugs(vals_list, 'name')
         
-        # Auto-generate SEO fields if not provided
-        if not vals.get('seo_title') and vals.get('name'):
-            vals['seo_title'] = vals['name'][:60]
+        for vals in vals_list:
+            # Auto-generate SEO fields if not provided
+            if not vals.get('seo_title') and vals.get('name'):
+                vals['seo_title'] = vals['name'][:60]
+            
+            if not vals.get('seo_description') and vals.get('description'):
+                vals['seo_description'] = vals['description'][:160]
         
-        if not vals.get('seo_description') and vals.get('description'):
-            vals['seo_description'] = vals['description'][:160]
-        
-        return super().create(vals)
+        return super().create(vals_list)
     
     def write(self, vals):
         """Enhanced write with slug regeneration"""
         if 'name' in vals and not vals.get('slug'):
+            if len(self) > 1:
+                return self._write_with_unique_slugs(vals, 'name')
             vals['slug'] = self._generate_slug(vals['name'])
         
         return super().write(vals)
     
-    def _generate_slug(self, name):
-        """Generate URL-friendly slug from name"""
-        if not name:
-            return ''
-        
-        # Convert to lowercase and replace spaces/special chars with hyphens
-        slug = re.sub(r'[^\w\s-]', '', name.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        # Ensure uniqueness
-        original_slug = slug
-        counter = 1
-        while self.search([('slug', '=', slug), ('id', '!=', self.id)]):
-            slug = f"{original_slug}-{counter}"
-            counter += 1
-        
-        return slug
-    
     @api.constrains('parent_id')
     def _check_parent_recursion(self):
         """Prevent recursive parent relationships"""
@@ -152,6 +135,7 @@ class AlromaihBlogCategory(models.Model):
 class AlromaihBlogTag(models.Model):
     _name = 'alromaih.blog.tag'
     _description = _('Blog Tag')
+    _inherit = ['alromaih.slug.mixin']
     _rec_name = 'name'
     _order = 'name'
     
@@ -185,39 +169,21 @@ class AlromaihBlogTag(models.Model):
         for tag in self:
             tag.blog_count = len(tag.blog_ids.filtered(lambda p: p.status == 'published'))
     
-    @api.model
-    def create(self, vals):
-        """Enhanced create with slug generation"""
-        if not vals.get('slug') and vals.get('name'):
-            vals['slug'] = self._generate_slug(vals['name'])
-        
-        return super().create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Enhanced create with batched slug generation"""
+        self._fill_missing_slugs(vals_list, 'name')
+        return super().create(vals_list)
     
     def write(self, vals):
         """Enhanced write with slug regeneration"""
         if 'name' in vals and not vals.get('slug'):
+            if len(self) > 1:
+                return self._write_with_unique_slugs(vals, 'name')
             vals['slug'] = self._generate_slug(vals['name'])
         
         return super().write(vals)
     
-    def _generate_slug(self, name):
-        """Generate URL-friendly slug from name"""
-        if not name:
-            return ''
-        
-        # Convert to lowercase and replace spaces/special chars with hyphens
-        slug = re.sub(r'[^\w\s-]', '', name.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        # Ensure uniqueness
-        original_slug = slug
-        counter = 1
-        while self.search([('slug', '=', slug), ('id', '!=', self.id)]):
-            slug = f"{original_slug}-{counter}"
-            counter += 1
-        
-        return slug
-    
     @api.constrains('slug')
     def _check_slug_unique(self):
         """Ensure slug is unique"""
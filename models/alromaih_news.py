@@ -9,10 +9,16 @@ _logger = logging.getLogger(__name__)
 class AlromaiNews(models.Model):
     _name = 'alromaih.news'
     _description = _('Alromaih News')
-    _inherit = ['mail.thread', 'mail.activity.mixin', 'website.seo.metadata', 'website.published.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'website.seo.metadata', 'website.published.mixin',
+                'alromaih.search.mixin', 'alromaih.slug.mixin']
     _rec_name = 'title'
     _order = 'publish_date desc, create_date desc'
     
+    # Full-text search index
+    _search_title_field = 'title'
+    _search_body_fields = ['subtitle', 'summary', 'content']
+    _search_slug_field = 'slug'
+    
     # Basic Information
     title = fields.Char(string='News Title', required=True, translate=True, tracking=True)
     subtitle = fields.Char(string='Subtitle', translate=True)
@@ -95,27 +101,35 @@ class AlromaiNews(models.Model):
     active = fields.Boolean(default=True)
     sequence = fields.Integer(default=10)
     
-    @api.model
-    def create(self, vals):
-        """Enhanced create with slug generation"""
-        if not vals.get('slug') and vals.get('title'):
-            vals['slug'] = self._generate_slug(vals['title'])
-        
-        if vals.get('status') == 'published' and not vals.get('publish_date'):
-            vals['publish_date'] = fields.Datetime.now()
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Enhanced create with batched slug generation"""
+        self._fill_missing_slugs(vals_list, 'title')
         
-        # Auto-generate SEO fields
-        if not vals.get('seo_title') and vals.get('title'):
-            vals['seo_title'] = vals['title'][:60]
+        for vals in vals_list:
+            if vals.get('status') == 'published' and not vals.get('publish_date'):
+                vals['publish_date'] = fields.Datetime.now()
+            
+            # Auto-generate SEO fields
+            if not vals.get('seo_title') and vals.get('title'):
+                vals['seo_title'] = vals['title'][:60]
+            
+            if not vals.get('seo_description') and vals.get('summary'):
+                vals['seo_description'] = vals['summary'][:160]
         
-        if not vals.get('seo_description') and vals.get('summary'):
-            vals['seo_description'] = vals['summary'][:160]
-        
-        return super().create(vals)
+        return super().create(vals_list)
+    
+    def _is_search_public(self):
+        return set(self.filtered('is_published').ids)
+    
+    def _get_search_visibility_fields(self):
+        return ['active', 'status', 'is_published', 'website_published']
     
     def write(self, vals):
         """Enhanced write with slug and status handling"""
         if 'title' in vals and not vals.get('slug'):
+            if len(self) > 1:
+                return self._write_with_unique_slugs(vals, 'title')
             vals['slug'] = self._generate_slug(vals['title'])
         
         if vals.get('status') == 'published' and not self.publish_date:
@@ -123,24 +137,6 @@ class AlromaiNews(models.Model):
         
         return super().write(vals)
     
-    def _generate_slug(self, title):
-        """Generate URL-friendly slug"""
-        import re
-        if not title:
-            return ''
-        
-        slug = re.sub(r'[^\w\s-]', '', title.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        # Ensure uniqueness
-        original_slug = slug
-        counter = 1
-        while self.search([('slug', '=', slug), ('id', '!=', self.id)]):
-            slug = f"{original_slug}-{counter}"
-            counter += 1
-        
-        return slug
-    
     def action_publish(self):
         """Publish the news"""
         for news in self:
@@ -187,7 +183,7 @@ class AlromaiNews(models.Model):
 class AlromaiNewsCategory(models.Model):
     _name = 'alromaih.news.category'
     _description = _('News Category')
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'alromaih.slug.mixin']
     _rec_name = 'name'
     _order = 'sequence, name'
     
@@ -222,31 +218,17 @@ class AlromaiNewsCategory(models.Model):
         for category in self:
             category.news_count = len(category.news_ids.filtered(lambda n: n.status == 'published'))
     
-    @api.model
-    def create(self, vals):
-        """Enhanced create with slug generation"""
-        if not vals.get('slug') and vals.get('name'):
-            vals['slug'] = self._generate_slug(vals['name'])
-        return super().create(vals)
-    
-    def _generate_slug(self, name):
-        """Generate URL-friendly slug"""
-        import re
-        slug = re.sub(r'[^\w\s-]', '', name.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        original_slug = slug
-        counter = 1
-        while self.search([('slug', '=', slug), ('id', '!=', self.id)]):
-            slug = f"{original_slug}-{counter}"
-            counter += 1
-        
-        return slug
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Enhanced create with batched slug generation"""
+        self._fill_missing_slugs(vals_list, 'name')
+        return super().create(vals_list)
 
 
 class AlromaiNewsTag(models.Model):
     _name = 'alromaih.news.tag'
     _description = _('News Tag')
+    _inherit = ['alromaih.slug.mixin']
     _rec_name = 'name'
     _order = 'name'
     
@@ -272,26 +254,11 @@ class AlromaiNewsTag(models.Model):
         for tag in self:
             tag.news_count = len(tag.news_ids.filtered(lambda n: n.status == 'published'))
     
-    @api.model
-    def create(self, vals):
-        """Enhanced create with slug generation"""
-        if not vals.get('slug') and vals.get('name'):
-            vals['slug'] = self._generate_slug(vals['name'])
-        return super().create(vals)
-    
-    def _generate_slug(self, name):
-        """Generate URL-friendly slug"""
-        import re
-        slug = re.sub(r'[^\w\s-]', '', name.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        
-        original_slug = slug
-        counter = 1
-        while self.search([('slug', '=', slug), ('id', '!=', self.id)]):
-            slug = f"{original_slug}-{counter}"
-            counter += 1
-        
-        return slug
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Enhanced create with batched slug generation"""
+        self._fill_missing_slugs(vals_list, 'name')
+        return super().create(vals_list)
 
 
 class AlromaiPressRelease(models.Model):
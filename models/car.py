@@ -1,5 +1,6 @@
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from datetime import datetime, timedelta
+import json
 import random  # For demo data purposes, will be removed in production
 import logging
 from odoo.exceptions import ValidationError
@@ -10,10 +11,16 @@ _logger = logging.getLogger(__name__)
 class Car(models.Model):
     _name = 'alromaih.car'
     _description = _('Car')
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'alromaih.search.mixin', 'alromaih.slug.mixin']
     _rec_name = 'name'
     _order = 'sequence, id'
     
+    # Full-text search index
+    _search_title_field = 'name'
+    _search_body_fields = ['description', 'meta_description', 'meta_keywords']
+    _search_slug_field = 'seo_url_slug'
+    _slug_field = 'seo_url_slug'
+    
     name = fields.Char(string='Name', translate=True, required=True, 
                        help="Car name - editable and translatable for multilingual support")
     suggested_name = fields.Char(string='Suggested Name', translate=True,
@@ -87,9 +94,9 @@ class Car(models.Model):
     
     # Dynamic category fields for tabs
     specification_categories = fields.Text(string='Specification Categories JSON', 
-                                         compute='_compute_specification_categories')
+                                         compute='_compute_specification_payloads')
     specifications_by_category = fields.Text(string='Specifications by Category JSON',
-                                            compute='_compute_specifications_by_category')
+                                            compute='_compute_specification_payloads')
     
     # Specification statistics
     total_specifications = fields.Integer(string='Total Specifications', 
@@ -417,6 +424,13 @@ class Car(models.Model):
             _logger.warning(f"Error generating name suggestion: {e}")
             return ''
 
+    @api.model
+    def _slugify(self, text):
+        """Car slugs keep ASCII letters and digits only"""
+        import re
+        slug = re.sub(r'[^a-zA-Z0-9\s]', '', text or '')
+        return re.sub(r'\s+', '-', slug.strip()).lower()
+
     @api.model
     def create(self, vals):
         """Enhanced create method with auto-operations and variant generation"""
@@ -470,10 +484,7 @@ class Car(models.Model):
             # Generate SEO slug from name if provided
             if vals.get('name') and not vals.get('seo_url_slug'):
                 try:
-                    import re
-                    slug = re.sub(r'[^a-zA-Z0-9\s]', '', vals['name'])
-                    slug = re.sub(r'\s+', '-', slug.strip()).lower()
-                    vals['seo_url_slug'] = slug
+                    vals['seo_url_slug'] = self._generate_slug(vals['name'])
                 except Exception as e:
                     _logger.warning(f"Error generating SEO slug: {str(e)}")
             
@@ -565,6 +576,7 @@ class Car(models.Model):
                 body=_('Car "%s" created successfully') % car.name,
                 message_type='notification'
             )
+            self.env['alromaih.dashboard.bus']._publish('car_created', car.ids)
             
             return car
             
@@ -584,18 +596,35 @@ class Car(models.Model):
         try:
             # Generate SEO slug from name if name changed and no slug provided
             if vals.get('name') and not vals.get('seo_url_slug'):
-                import re
-                slug = re.sub(r'[^a-zA-Z0-9\s]', '', vals['name'])
-                slug = re.sub(r'\s+', '-', slug.strip()).lower()
-                vals['seo_url_slug'] = slug
+                if len(self) > 1:
+                    return self._write_with_unique_slugs(vals, 'name')
+                vals['seo_url_slug'] = self._generate_slug(vals['name'])
+            
+            variant_fields_changed = 'color_ids' in vals or 'primary_color_id' in vals
+            price_fields_changed = 'cash_price' in vals or 'vat_percentage' in vals
             
             # Store old values for comparison
-            old_colors = {rec.id: rec.color_ids.ids for rec in self}
-            old_primary_colors = {rec.id: rec.primary_color_id.id if rec.primary_color_id else None for rec in self}
+            old_colors = {}
+            old_primary_colors = {}
+            if variant_fields_changed:
+                old_colors = {rec.id: rec.color_ids.ids for rec in self}
+                old_primary_colors = {rec.id: rec.primary_color_id.id if rec.primary_color_id else None for rec in self}
             
             # Perform the write
             result = super(Car, self).write(vals)
             
+            # Keep variant and offer prices in line with the new car price
+            if price_fields_changed and not self.env.context.get('alromaih_skip_price_propagation'):
+                self._propagate_prices()
+            
+            if not variant_fields_changed:
+                return result
+            
+            # Recordset writes (mass edits) reconcile variants for all cars at once
+            if len(self) > 1:
+                self._reconcile_color_variants(vals, old_colors, old_primary_colors)
+                return result
+            
             # Auto-operations after write
             for record in self:
                 # Handle color changes - regenerate variants
@@ -640,73 +669,162 @@ class Car(models.Model):
         for rec in self:
             rec.has_active_offer = any(offer.is_active for offer in rec.offer_ids)
     
-    @api.depends('specification_ids')
-    def _compute_specification_categories(self):
-        """Compute available specification categories for dynamic tabs (excludes Car Information)"""
-        for rec in self:
-            categories = rec.get_car_information_categories()
-            import json
-            rec.specification_categories = json.dumps(categories)
-    
     @api.depends('specification_ids', 'specification_ids.category_id')
-    def _compute_specifications_by_category(self):
-        """Compute specifications organized by category (excludes key attributes)"""
+    def _compute_specification_payloads(self):
+        """Compute the specification categories for dynamic tabs (excludes Car Information)
+        and the specifications organized by category (excludes key attributes)"""
         for rec in self:
-            specifications_data = {}
-            
-            if rec.specification_ids:
-                # Group non-key specifications by category
-                try:
-                    # Try to filter by is_key_attribute if the field exists
-                    non_key_specs = rec.specification_ids.filtered(
-                        lambda s: not s.attribute_id.is_key_attribute
-                    )
-                except Exception:
-                    # Fallback if is_key_attribute field doesn't exist yet
-                    non_key_specs = rec.specification_ids
-                
-                for category in non_key_specs.mapped('category_id').filtered(lambda c: c.active):
-                    category_specs = non_key_specs.filtered(lambda s: s.category_id == category)
-                    
-                    specifications_data[str(category.id)] = {
-                        'category_id': category.id,
-                        'category_name': category.name,
-                        'category_icon': category.icon or 'fa-cog',
-                        'category_sequence': category.sequence,
-                        'specifications': []
-                    }
-                    
-                    for spec in category_specs.sorted(lambda s: s.sequence):
-                        spec_data = {
-                            'id': spec.id,
-                            'attribute_id': spec.attribute_id.id,
-                            'attribute_name': spec.attribute_id.name,
-                            'display_value': getattr(spec, 'display_value', None),
-                            'custom_value': getattr(spec, 'custom_value', None),
-                            'sequence': getattr(spec, 'sequence', 10),
-                            'is_required': getattr(spec, 'is_required', False),
-                            'is_highlighted': getattr(spec, 'is_highlighted', False),
-                            'display_type': spec.attribute_id.display_type,
-                            'attribute_icon': getattr(spec.attribute_id, 'icon', None),
-                            'help_text': getattr(spec.attribute_id, 'description', None)
-                        }
-                        specifications_data[str(category.id)]['specifications'].append(spec_data)
-            
-            import json
-            rec.specifications_by_category = json.dumps(specifications_data)
+            rec.specification_categories, rec.specifications_by_category = rec._get_specification_payloads()
+    
+    def _get_specification_payloads(self):
+        """Return the (categories, specifications by category) JSON payloads of the car.
+        
+        Saved cars are served from a cache keyed by a signature of their specs, so
+        the payloads are only rebuilt when a spec, attribute or category changes.
+        """
+        self.ensure_one()
+        if not isinstance(self.id, int):
+            # Unsaved record (onchange): nothing in the database to key on
+            return self._build_specification_payloads()
+        return self._get_cached_specification_payloads(self.id, self._get_specification_signature())
+    
+    def _get_specification_signature(self):
+        """Cheap fingerprint of the car's specifications: count and latest write dates
+        of the specs, their attributes and categories.
+        
+        Attribute values are left out on purpose: the payloads only read the spec's
+        stored display_value, which does not depend on the values' names.
+        """
+        self.env['alromaih.car.specification'].flush_model()
+        self.env.cr.execute("""
+            SELECT COUNT(s.id), MAX(s.write_date), MAX(a.write_date), MAX(c.write_date)
+              FROM alromaih_car_specification s
+         LEFT JOIN product_attribute a ON a.id = s.attribute_id
+         LEFT JOIN product_attribute_category c ON c.id = s.category_id
+             WHERE s.car_id = %s
+        """, [self.id])
+        return tuple(str(value) for value in self.env.cr.fetchone())
+    
+    @tools.ormcache('car_id', 'signature', 'self.env.lang')
+    def _get_cached_specification_payloads(self, car_id, signature):
+        return self.browse(car_id)._build_specification_payloads()
+    
+    def _group_specifications_by_category(self):
+        """Group non-key specifications by active category in a single pass.
+        
+        Returns an ordered {category: [specs sorted by sequence]} dict, categories
+        in order of first appearance.
+        """
+        self.ensure_one()
+        groups = {}
+        for spec in self.specification_ids:
+            category = spec.category_id
+            if not category or not category.active:
+                continue
+            if getattr(spec.attribute_id, 'is_key_attribute', False):
+                continue
+            groups.setdefault(category, []).append(spec)
+        for specs in groups.values():
+            specs.sort(key=lambda s: s.sequence)
+        return groups
+    
+    def _build_specification_payloads(self):
+        """Build the categories and specifications-by-category JSON payloads"""
+        groups = self._group_specifications_by_category()
+        
+        specifications_data = {}
+        for category, specs in groups.items():
+            specifications_data[str(category.id)] = {
+                'category_id': category.id,
+                'category_name': category.name,
+                'category_icon': category.icon or 'fa-cog',
+                'category_sequence': category.sequence,
+                'specifications': [{
+                    'id': spec.id,
+                    'attribute_id': spec.attribute_id.id,
+                    'attribute_name': spec.attribute_id.name,
+                    'display_value': getattr(spec, 'display_value', None),
+                    'custom_value': getattr(spec, 'custom_value', None),
+                    'sequence': getattr(spec, 'sequence', 10),
+                    'is_required': getattr(spec, 'is_required', False),
+                    'is_highlighted': getattr(spec, 'is_highlighted', False),
+                    'display_type': spec.attribute_id.display_type,
+                    'attribute_icon': getattr(spec.attribute_id, 'icon', None),
+                    'help_text': getattr(spec.attribute_id, 'description', None)
+                } for spec in specs]
+            }
+        
+        categories = self._categories_from_groups(groups)
+        return json.dumps(categories), json.dumps(specifications_data)
+    
+    def _categories_from_groups(self, groups):
+        """Tab descriptors for grouped specifications (excluding Car Information)"""
+        return [{
+            'id': category.id,
+            'name': category.name,
+            'icon': category.icon or 'fa-cog',
+            'sequence': category.sequence,
+            'display_type': category.display_type,
+            'count': len(specs)
+        } for category, specs in sorted(groups.items(), key=lambda item: item[0].sequence)
+            if category.name != 'Car Information']
     
-    @api.depends('specification_ids')
+    @api.depends('specification_ids', 'specification_ids.attribute_value_id', 'specification_ids.custom_value')
     def _compute_specification_stats(self):
         """Compute specification completion statistics"""
+        counts = self._read_specification_counts()
         for rec in self:
-            total = len(rec.specification_ids)
-            filled = len(rec.specification_ids.filtered(
-                lambda s: s.attribute_value_id or getattr(s, 'custom_value', None)
-            ))
+            if isinstance(rec.id, int):
+                total, filled = counts.get(rec.id, (0, 0))
+            else:
+                # Unsaved record (onchange): count in memory
+                total = len(rec.specification_ids)
+                filled = len(rec.specification_ids.filtered(
+                    lambda s: s.attribute_value_id or s.custom_value
+                ))
             
             rec.total_specifications = total
             rec.filled_specifications = filled
             rec.specification_completion = (filled / max(total, 1)) * 100
+    
+    def _read_specification_counts(self):
+        """Return {car_id: (total, filled)} for the saved cars of self using grouped queries"""
+        car_ids = [car_id for car_id in self.ids if isinstance(car_id, int)]
+        if not car_ids:
+            return {}
+        Specification = self.env['alromaih.car.specification']
+        totals = dict(Specification._read_group(
+            [('car_id', 'in', car_ids)], ['car_id'], ['__count'],
+        ))
+        filled = dict(Specification._read_group(
+            [('car_id', 'in', car_ids), '|', ('attribute_value_id', '!=', False), ('custom_value', '!=', False)],
+            ['car_id'], ['__count'],
+        ))
+        return {car.id: (count, filled.get(car, 0)) for car, count in totals.items()}
+    
+    def action_recompute_specification_stats(self, batch_size=1000):
+        """Maintenance action: recompute specification completion in chunks (whole catalog if empty)"""
+        car_ids = self.ids or self.with_context(active_test=False).search([], order='id').ids
+        stat_fields = [self._fields[name] for name in
+                       ('total_specifications', 'filled_specifications', 'specification_completion')]
+        
+        for start in range(0, len(car_ids), batch_size):
+            cars = self.browse(car_ids[start:start + batch_size])
+            for field in stat_fields:
+                self.env.add_to_compute(field, cars)
+            cars.flush_recordset([field.name for field in stat_fields])
+            self.env.invalidate_all()
+            _logger.info("Specification stats: recomputed %d/%d cars", min(start + batch_size, len(car_ids)), len(car_ids))
+        
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Specification Stats Updated'),
+                'message': _('Recomputed specification completion for %d cars.') % len(car_ids),
+                'type': 'success',
+            }
+        }
             
     @api.onchange('brand_id')
     def _onchange_brand_id(self):
@@ -1057,52 +1175,55 @@ class Car(models.Model):
             self.primary_variant_id = False
             return True
         
-        created_variants = self.env['alromaih.car.variant']  # Start with empty recordset
-        updated_variants = []
+        Variant = self.env['alromaih.car.variant']
+        # A color may have several variants: keep them all
+        variants_by_color = {}
+        for variant in self.variant_ids:
+            variants_by_color[variant.color_id.id] = variants_by_color.get(variant.color_id.id, Variant) | variant
+        price = self.cash_price_with_vat or 0.0
+        primary_color_id = self.primary_color_id.id if self.primary_color_id else False
         
-        # Create/update variants for each selected color
+        # Split selected colors into variants to create and variants to refresh
+        create_vals_list = []
+        updated_variants = Variant
         for color in self.color_ids:
-            # Check if variant already exists for this color
-            existing_variant = self.variant_ids.filtered(lambda v: v.color_id.id == color.id)
-            
-            if not existing_variant:
-                # Create new variant for this color
-                variant_name = f"{self.name} - {color.name}" if self.name else f"Car - {color.name}"
-                new_variant = self.env['alromaih.car.variant'].create({
+            variant_name = f"{self.name} - {color.name}" if self.name else f"Car - {color.name}"
+            existing_variants = variants_by_color.get(color.id)
+            if not existing_variants:
+                create_vals_list.append({
                     'car_id': self.id,
                     'color_id': color.id,
                     'name': variant_name,
-                    'price': self.cash_price_with_vat or 0.0,
-                    'is_primary': color.id == self.primary_color_id.id if self.primary_color_id else False,
+                    'price': price,
+                    'is_primary': color.id == primary_color_id,
                 })
-                created_variants |= new_variant  # Use |= to maintain recordset
             else:
-                # Update existing variant name if car name changed
-                existing_variant.name = f"{self.name} - {color.name}" if self.name else f"Car - {color.name}"
-                existing_variant.price = self.cash_price_with_vat or 0.0
-                updated_variants.append(existing_variant)
+                updated_variants |= existing_variants
+        
+        created_variants = Variant.create(create_vals_list) if create_vals_list else Variant
+        
+        # Existing variant names are computed from car and color; only the price needs a grouped write
+        if updated_variants:
+            updated_variants.filtered(lambda v: v.price != price).write({'price': price})
         
         # Remove variants for colors no longer selected
-        removed_variants = self.variant_ids.filtered(lambda v: v.color_id not in self.color_ids)
+        selected_color_ids = set(self.color_ids.ids)
+        removed_variants = Variant.concat(*(
+            variants for color_id, variants in variants_by_color.items()
+            if color_id not in selected_color_ids
+        ))
         if removed_variants:
             # If removing the primary variant, clear the primary reference
             if self.primary_variant_id in removed_variants:
                 self.primary_variant_id = False
             removed_variants.unlink()
         
-        # Log variant operations - fix the mapped() issue
+        # Log variant operations
         messages = []
         if created_variants:
-            # Safe handling of created_variants recordset
-            try:
-                color_names = ', '.join(created_variants.mapped('color_id.name'))
-            except (AttributeError, TypeError):
-                # Fallback if mapped() fails
-                color_names = f"{len(created_variants)} variants"
-            
             messages.append(_('Created %d new variants: %s') % (
                 len(created_variants),
-                color_names
+                ', '.join(created_variants.mapped('color_id.name'))
             ))
         if updated_variants:
             messages.append(_('Updated %d existing variants') % len(updated_variants))
@@ -1152,6 +1273,197 @@ class Car(models.Model):
         
         return True
 
+    def _reconcile_color_variants(self, vals, old_colors, old_primary_colors):
+        """Set-based counterpart of the per-record variant logic in write().
+        
+        Applies the same rules as the single-record path (missing primary colors
+        are added to the available colors, the first color becomes primary when
+        none is set, one variant per color, one primary variant per car) but
+        computes the needed creations, deletions and primary flags for the whole
+        recordset and applies them with batched create/write/unlink calls. No
+        chatter message is posted per car; a summary is logged instead.
+        """
+        Variant = self.env['alromaih.car.variant'].with_context(alromaih_skip_primary_sync=True)
+        
+        # Primary color must be one of the available colors
+        if 'primary_color_id' in vals:
+            missing_by_color = {}
+            for car in self.filtered(lambda c: c.primary_color_id and c.primary_color_id not in c.color_ids):
+                missing_by_color.setdefault(car.primary_color_id.id, []).append(car.id)
+            for color_id, car_ids in missing_by_color.items():
+                super(Car, self.browse(car_ids)).write({'color_ids': [(4, color_id)]})
+        
+        # First color becomes primary when colors were added and no primary was ever set
+        if 'color_ids' in vals:
+            first_color_groups = {}
+            for car in self.filtered(lambda c: c.color_ids and not c.primary_color_id
+                                     and old_primary_colors.get(c.id) is None):
+                first_color_groups.setdefault(car.color_ids[0].id, []).append(car.id)
+            for color_id, car_ids in first_color_groups.items():
+                super(Car, self.browse(car_ids)).write({'primary_color_id': color_id})
+        
+        cars = self.filtered(lambda c: c.color_ids.ids != old_colors.get(c.id, [])
+                             or 'primary_color_id' in vals)
+        if not cars:
+            return True
+        
+        # Existing variants for all affected cars in one query, grouped per color
+        # (a color may have several variants)
+        variants_by_car = {car.id: {} for car in cars}
+        for variant in Variant.search([('car_id', 'in', cars.ids)], order='id'):
+            colors = variants_by_car[variant.car_id.id]
+            colors[variant.color_id.id] = colors.get(variant.color_id.id, Variant) | variant
+        
+        create_vals_list = []
+        to_remove = Variant
+        reprice_groups = {}
+        for car in cars:
+            existing = variants_by_car[car.id]
+            selected_color_ids = set(car.color_ids.ids)
+            price = car.cash_price_with_vat or 0.0
+            for color in car.color_ids:
+                variants = existing.get(color.id)
+                if not variants:
+                    create_vals_list.append({
+                        'car_id': car.id,
+                        'color_id': color.id,
+                        'name': f"{car.name} - {color.name}" if car.name else f"Car - {color.name}",
+                        'price': price,
+                        'is_primary': False,
+                    })
+                else:
+                    reprice_groups.setdefault(price, []).extend(variants.filtered(lambda v: v.price != price).ids)
+            to_remove |= Variant.concat(*(
+                variants for color_id, variants in existing.items() if color_id not in selected_color_ids
+            ))
+        
+        if to_remove:
+            cars_losing_primary = cars.filtered(lambda c: c.primary_variant_id in to_remove)
+            if cars_losing_primary:
+                super(Car, cars_losing_primary).write({'primary_variant_id': False})
+            to_remove.unlink()
+        created = Variant.create(create_vals_list) if create_vals_list else Variant
+        for price, variant_ids in reprice_groups.items():
+            Variant.browse(variant_ids).write({'price': price})
+        
+        # Primary flags: exactly the variant matching the primary color of each car
+        primary_targets = {}
+        for variant in created:
+            colors = variants_by_car[variant.car_id.id]
+            colors[variant.color_id.id] = colors.get(variant.color_id.id, Variant) | variant
+        for car in cars:
+            candidates = variants_by_car[car.id].get(car.primary_color_id.id, Variant) if car.primary_color_id else Variant
+            candidates -= to_remove
+            # Keep the current primary among duplicates, otherwise the oldest variant
+            target = (candidates.filtered('is_primary') or candidates)[:1]
+            primary_targets[car.id] = target or None
+        
+        target_ids = {target.id for target in primary_targets.values() if target}
+        all_variants = Variant.concat(*(
+            variants for colors in variants_by_car.values() for variants in colors.values()
+        )) - to_remove
+        to_unset = all_variants.filtered(lambda v: v.is_primary and v.id not in target_ids)
+        to_set = all_variants.filtered(lambda v: not v.is_primary and v.id in target_ids)
+        if to_unset:
+            to_unset.write({'is_primary': False})
+        if to_set:
+            to_set.write({'is_primary': True})
+        for car in cars:
+            target = primary_targets[car.id]
+            if car.primary_variant_id != (target or car.primary_variant_id.browse()):
+                super(Car, car).write({'primary_variant_id': target.id if target else False})
+        
+        _logger.info(
+            "Reconciled variants for %d cars: %d created, %d removed, %d repriced",
+            len(cars), len(created), len(to_remove), sum(len(ids) for ids in reprice_groups.values())
+        )
+        return True
+    
+    def unlink(self):
+        """Record deletion tombstones for the cars and the variants/media deleted with them"""
+        Tombstone = self.env['alromaih.catalog.tombstone']
+        variants = self.env['alromaih.car.variant'].with_context(active_test=False).search([('car_id', 'in', self.ids)])
+        Tombstone._record_deletion(variants)
+        Tombstone._record_deletion(self.env['alromaih.car.media'].with_context(active_test=False).search([('car_id', 'in', self.ids)]))
+        Tombstone._record_deletion(self)
+        # Variants go through ondelete='cascade', which bypasses their unlink()
+        self.env['alromaih.search.document']._remove_documents(variants._name, variants.ids)
+        return super().unlink()
+    
+    def _is_search_public(self):
+        return set(self.filtered(lambda c: c.status == 'published').ids)
+    
+    def _get_search_visibility_fields(self):
+        return ['active', 'status']
+    
+    def _schedule_search_index(self):
+        super()._schedule_search_index()
+        # Variant visibility follows the car's publication status
+        self.env['alromaih.car.variant'].search([('car_id', 'in', self.ids)])._schedule_search_index()
+    
+    def _propagate_prices(self):
+        """Reprice all variants and offers depending on these cars with batched writes.
+        
+        Variant prices follow cash_price_with_vat; offer original/final prices are
+        then refreshed from the new variant or car price. Returns the number of
+        variants and offers updated.
+        """
+        if not self:
+            return 0, 0
+        
+        Variant = self.env['alromaih.car.variant'].with_context(alromaih_skip_price_propagation=True)
+        variants = Variant.search([('car_id', 'in', self.ids)])
+        
+        reprice_groups = {}
+        for variant in variants:
+            price = variant.car_id.cash_price_with_vat or 0.0
+            if variant.price != price:
+                reprice_groups.setdefault(price, []).append(variant.id)
+        for price, variant_ids in reprice_groups.items():
+            Variant.browse(variant_ids).write({'price': price})
+        
+        offers = self.env['alromaih.car.offer'].search([
+            '|', ('car_id', 'in', self.ids), ('car_variant_id', 'in', variants.ids)
+        ])
+        offer_count = offers._reprice()
+        
+        return sum(len(ids) for ids in reprice_groups.values()), offer_count
+    
+    def action_propagate_prices(self):
+        """Manual action to push car prices to variants and offers"""
+        variant_count, offer_count = self._propagate_prices()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Prices Updated'),
+                'message': _('Repriced %d variants and %d offers.') % (variant_count, offer_count),
+                'type': 'success',
+            }
+        }
+    
+    @api.model
+    def reprice_catalog(self, vat_percentage=None, batch_size=500):
+        """Mass-repricing job: optionally apply a new VAT percentage to the whole catalog,
+        then propagate prices to variants and offers chunk by chunk"""
+        car_ids = self.with_context(active_test=False).search([], order='id').ids
+        variant_total = offer_total = 0
+        
+        for start in range(0, len(car_ids), batch_size):
+            cars = self.browse(car_ids[start:start + batch_size])
+            if vat_percentage is not None:
+                # Skip write()'s own propagation: the whole chunk is repriced once below
+                cars.filtered(lambda c: c.vat_percentage != vat_percentage).with_context(
+                    alromaih_skip_price_propagation=True).write({'vat_percentage': vat_percentage})
+            variant_count, offer_count = cars._propagate_prices()
+            variant_total += variant_count
+            offer_total += offer_count
+            self.env.flush_all()
+            self.env.invalidate_all()
+            _logger.info("Catalog repricing: processed %d/%d cars", min(start + batch_size, len(car_ids)), len(car_ids))
+        
+        return {'cars': len(car_ids), 'variants': variant_total, 'offers': offer_total}
+    
     def generate_variants(self):
         """Manual variant generation (for buttons/actions)"""
         self.ensure_one()
@@ -1224,6 +1536,74 @@ class Car(models.Model):
             }
         }
     
+    def action_bulk_apply_specification_template(self, template=None, remove_extra=False, batch_size=200):
+        """Apply a specification template to many cars by diffing their existing specs.
+        
+        Missing template lines are added with one multi-create per batch, filled
+        specifications are kept untouched and, with remove_extra, specs whose
+        attribute is not in the template are removed.
+        """
+        Template = self.env['alromaih.car.specification.template']
+        Specification = self.env['alromaih.car.specification']
+        default_template = template or Template.get_default_template()
+        
+        # Group cars by the template they should follow
+        cars_by_template = {}
+        for car in self:
+            car_template = template or car.specification_template_id or default_template
+            if car_template:
+                cars_by_template.setdefault(car_template, self.browse())
+                cars_by_template[car_template] |= car
+        
+        created_count = removed_count = processed = 0
+        for car_template, cars in cars_by_template.items():
+            line_vals = Specification._prepare_template_line_vals(car_template)
+            template_attribute_ids = {vals['attribute_id'] for vals in line_vals}
+            cars.filtered(lambda c: c.specification_template_id != car_template).write({
+                'specification_template_id': car_template.id,
+            })
+            
+            for start in range(0, len(cars), batch_size):
+                batch = cars[start:start + batch_size]
+                existing = Specification.search_read(
+                    [('car_id', 'in', batch.ids)], ['car_id', 'attribute_id'], load=None,
+                )
+                attributes_by_car = {}
+                for spec in existing:
+                    attributes_by_car.setdefault(spec['car_id'], set()).add(spec['attribute_id'])
+                
+                create_vals = [
+                    dict(vals, car_id=car.id)
+                    for car in batch
+                    for vals in line_vals
+                    if vals['attribute_id'] not in attributes_by_car.get(car.id, set())
+                ]
+                if create_vals:
+                    Specification.create(create_vals)
+                    created_count += len(create_vals)
+                
+                if remove_extra:
+                    extra_ids = [spec['id'] for spec in existing if spec['attribute_id'] not in template_attribute_ids]
+                    if extra_ids:
+                        Specification.browse(extra_ids).unlink()
+                        removed_count += len(extra_ids)
+                
+                processed += len(batch)
+                self.env.flush_all()
+                _logger.info("Template %s: applied to %d/%d cars (%d specs added, %d removed)",
+                             car_template.name, processed, len(self), created_count, removed_count)
+        
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Template Applied'),
+                'message': _('Updated %d cars: %d specifications added, %d removed.') % (
+                    processed, created_count, removed_count),
+                'type': 'success',
+            }
+        }
+    
     def action_view_variants(self):
         self.ensure_one()
         return {
@@ -1533,6 +1913,7 @@ class Car(models.Model):
             key_specs = self.env['alromaih.car.specification']
         
         # Add key specifications
+        signatures = self._get_attribute_values_signatures(key_specs.attribute_id.ids)
         for spec in key_specs:
             attr = spec.attribute_id
             car_info[attr.name] = {
@@ -1544,7 +1925,7 @@ class Car(models.Model):
                 'inline_editable': getattr(attr, 'inline_editable', True),
                 'display_type': attr.display_type,
                 'sequence': getattr(spec, 'sequence', 10) + 100,  # Core info comes first
-                'available_values': self._get_attribute_available_values(attr)
+                'available_values': self._get_attribute_available_values(attr, signatures[attr.id])
             }
         
         # Sort by sequence
@@ -1682,17 +2063,41 @@ class Car(models.Model):
         
         return core_info
 
-    def _get_attribute_available_values(self, attribute):
+    def _get_attribute_available_values(self, attribute, signature=None):
         """Get available values for an attribute"""
-        values = []
-        for value in attribute.value_ids:
-            values.append({
-                'id': value.id,
-                'name': value.name,
-                'display_value': value.display_value or value.name,
-                'html_color': getattr(value, 'html_color', None)
-            })
-        return values
+        if signature is None:
+            signature = self._get_attribute_values_signatures(attribute.ids)[attribute.id]
+        # Copy the cached dicts so callers can't alter the shared cache entry
+        return [dict(value) for value in self._get_cached_attribute_values(attribute.id, signature)]
+
+    def _get_attribute_values_signatures(self, attribute_ids):
+        """{attribute_id: version of its values (count and latest write date)}, in one query"""
+        self.env['product.attribute.value'].flush_model()
+        self.env.cr.execute("""
+            SELECT attribute_id, COUNT(id), MAX(write_date)
+              FROM product_attribute_value
+             WHERE attribute_id = ANY(%s)
+          GROUP BY attribute_id
+        """, [list(attribute_ids)])
+        signatures = {attribute_id: ('0', 'None') for attribute_id in attribute_ids}
+        for attribute_id, count, last_write in self.env.cr.fetchall():
+            signatures[attribute_id] = (str(count), str(last_write))
+        return signatures
+
+    @tools.ormcache('attribute_id', 'signature', 'self.env.lang')
+    def _get_cached_attribute_values(self, attribute_id, signature):
+        """Serialized available values of an attribute, shared across cars.
+        
+        Keyed by the values' signature, so any create, write or delete of a value
+        yields a new entry without clearing other caches.
+        """
+        attribute = self.env['product.attribute'].browse(attribute_id)
+        return tuple({
+            'id': value.id,
+            'name': value.name,
+            'display_value': value.display_value or value.name,
+            'html_color': getattr(value, 'html_color', None)
+        } for value in attribute.value_ids)
 
     @api.model
     def update_key_specification(self, spec_id, new_value, value_type='custom'):
@@ -1733,37 +2138,9 @@ class Car(models.Model):
     def get_car_information_categories(self):
         """Get categories data for specification tabs (excluding Car Information)"""
         self.ensure_one()
-        
-        # Get all categories except Car Information
-        all_categories = []
-        if self.specification_ids:
-            categories_data = self.specification_ids.mapped('category_id').filtered(
-                lambda c: c.active and c.name != 'Car Information'
-            )
-            
-            for category in categories_data.sorted(lambda c: c.sequence):
-                try:
-                    # Try to filter by is_key_attribute if the field exists
-                    specs_count = len(self.specification_ids.filtered(
-                        lambda s: s.category_id == category and not s.attribute_id.is_key_attribute
-                    ))
-                except Exception:
-                    # Fallback if is_key_attribute field doesn't exist yet
-                    specs_count = len(self.specification_ids.filtered(
-                        lambda s: s.category_id == category
-                    ))
-                
-                if specs_count > 0:  # Only include categories with specifications
-                    all_categories.append({
-                        'id': category.id,
-                        'name': category.name,
-                        'icon': category.icon or 'fa-cog',
-                        'sequence': category.sequence,
-                        'display_type': category.display_type,
-                        'count': specs_count
-                    })
-        
-        return all_categories
+        if not self.specification_ids:
+            return []
+        return self._categories_from_groups(self._group_specifications_by_category())
 
     @api.model
     def create_sample_car_information(self):
@@ -2087,49 +2464,179 @@ class Car(models.Model):
     def get_frontend_safe_data(self):
         """Get car data in a format safe for frontend consumption with null checks"""
         self.ensure_one()
+        return self._serialize_frontend_data()[0]
+    
+    def get_frontend_safe_data_batch(self):
+        """List of get_frontend_safe_data payloads for every car of the recordset, in order"""
+        return self._serialize_frontend_data()
+    
+    def _serialize_frontend_data(self):
+        """Frontend-safe data for every car of the recordset, in the same shape as get_frontend_safe_data.
         
-        # Safe handling of color_ids for mapped() call
-        try:
-            if hasattr(self.color_ids, 'mapped'):
-                color_names = self.color_ids.mapped('name')
-            else:
-                # Convert list of IDs to recordset then get names
-                color_records = self.env['car.color'].browse(self.color_ids) if self.color_ids else self.env['car.color']
-                color_names = color_records.mapped('name') if color_records else []
-        except (AttributeError, TypeError):
-            color_names = []
+        Uses one read() for the cars, grouped counts for variants/offers/media and an
+        attachment lookup for thumbnails, so no one2many sets or binaries are loaded.
+        """
+        if not self:
+            return []
         
-        return {
-            'id': self.id,
-            'name': self.name or '',
-            'brand_id': self.brand_id.id if self.brand_id else None,
-            'brand_name': self.brand_id.name if self.brand_id else '',
-            'model_id': self.model_id.id if self.model_id else None,
-            'model_name': self.model_id.name if self.model_id else '',
-            'trim_id': self.trim_id.id if self.trim_id else None,
-            'trim_name': self.trim_id.name if self.trim_id else '',
-            'year_id': self.year_id.id if self.year_id else None,
-            'year_name': self.year_id.name if self.year_id else '',
-            'color_ids': self.color_ids.ids if self.color_ids else [],
-            'color_names': color_names,
-            'primary_color_id': self.primary_color_id.id if self.primary_color_id else None,
-            'primary_color_name': self.primary_color_id.name if self.primary_color_id else '',
-            'cash_price': self.cash_price or 0.0,
-            'vat_percentage': self.vat_percentage or 15.0,
-            'cash_price_with_vat': self.cash_price_with_vat or 0.0,
-            'finance_price': self.finance_price or 0.0,
-            'status': self.status or 'draft',
-            'active': bool(self.active),
-            'is_featured': bool(self.is_featured),
-            'sequence': self.sequence or 10,
-            'thumbnail_url': f'/web/image/alromaih.car/{self.id}/thumbnail' if self.thumbnail else None,
-            'specification_completion': self.specification_completion or 0.0,
-            'total_specifications': self.total_specifications or 0,
-            'filled_specifications': self.filled_specifications or 0,
-            'variant_count': len(self.variant_ids) if self.variant_ids else 0,
-            'offer_count': len(self.offer_ids) if self.offer_ids else 0,
-            'media_count': len(self.media_ids) if self.media_ids else 0
+        rows = self.read([
+            'name', 'brand_id', 'model_id', 'trim_id', 'year_id', 'color_ids', 'primary_color_id',
+            'primary_variant_id', 'cash_price', 'vat_percentage', 'cash_price_with_vat', 'finance_price',
+            'status', 'active', 'is_featured', 'sequence', 'specification_completion',
+            'total_specifications', 'filled_specifications',
+        ])
+        
+        color_ids = list({color_id for row in rows for color_id in row['color_ids']})
+        color_names = {color['id']: color['name'] for color in self.env['car.color'].browse(color_ids).read(['name'])}
+        
+        def count_by_car(model_name):
+            return {
+                car.id: count for car, count in self.env[model_name]._read_group(
+                    [('car_id', 'in', self.ids)], ['car_id'], ['__count'],
+                )
+            }
+        variant_counts = count_by_car('alromaih.car.variant')
+        offer_counts = count_by_car('alromaih.car.offer')
+        media_counts = count_by_car('alromaih.car.media')
+        
+        # The thumbnail is the primary variant's image: only check that its attachment exists
+        primary_variant_ids = [row['primary_variant_id'][0] for row in rows if row['primary_variant_id']]
+        variants_with_image = set()
+        if primary_variant_ids:
+            variants_with_image = {
+                attachment['res_id'] for attachment in self.env['ir.attachment'].sudo().search_read([
+                    ('res_model', '=', 'alromaih.car.variant'),
+                    ('res_field', '=', 'image'),
+                    ('res_id', 'in', primary_variant_ids),
+                ], ['res_id'])
+            }
+        
+        def many2one(value):
+            return (value[0], value[1]) if value else (None, '')
+        
+        result = []
+        for row in rows:
+            brand_id, brand_name = many2one(row['brand_id'])
+            model_id, model_name = many2one(row['model_id'])
+            trim_id, trim_name = many2one(row['trim_id'])
+            year_id, year_name = many2one(row['year_id'])
+            primary_color_id, primary_color_name = many2one(row['primary_color_id'])
+            primary_variant_id = row['primary_variant_id'][0] if row['primary_variant_id'] else None
+            
+            result.append({
+                'id': row['id'],
+                'name': row['name'] or '',
+                'brand_id': brand_id,
+                'brand_name': brand_name,
+                'model_id': model_id,
+                'model_name': model_name,
+                'trim_id': trim_id,
+                'trim_name': trim_name,
+                'year_id': year_id,
+                'year_name': year_name,
+                'color_ids': row['color_ids'],
+                'color_names': [color_names.get(color_id) for color_id in row['color_ids']],
+                'primary_color_id': primary_color_id,
+                'primary_color_name': primary_color_name,
+                'cash_price': row['cash_price'] or 0.0,
+                'vat_percentage': row['vat_percentage'] or 15.0,
+                'cash_price_with_vat': row['cash_price_with_vat'] or 0.0,
+                'finance_price': row['finance_price'] or 0.0,
+                'status': row['status'] or 'draft',
+                'active': bool(row['active']),
+                'is_featured': bool(row['is_featured']),
+                'sequence': row['sequence'] or 10,
+                'thumbnail_url': f"/web/image/alromaih.car/{row['id']}/thumbnail"
+                                 if primary_variant_id in variants_with_image else None,
+                'specification_completion': row['specification_completion'] or 0.0,
+                'total_specifications': row['total_specifications'] or 0,
+                'filled_specifications': row['filled_specifications'] or 0,
+                'variant_count': variant_counts.get(row['id'], 0),
+                'offer_count': offer_counts.get(row['id'], 0),
+                'media_count': media_counts.get(row['id'], 0),
+            })
+        return result
+    
+    def _get_catalog_export_rows(self):
+        """Serialize a chunk of cars for the NDJSON catalog export.
+        
+        Each row nests the car's variants with their effective prices, its public
+        key specifications and its public media URLs. Every related model is
+        read with one query for the whole chunk.
+        """
+        car_rows = self.read([
+            'name', 'seo_url_slug', 'brand_id', 'model_id', 'trim_id', 'year_id', 'status',
+            'cash_price', 'cash_price_with_vat', 'finance_price', 'has_active_offer', 'is_featured',
+            'meta_title', 'meta_description', 'write_date',
+        ])
+        rows_by_car = {}
+        for row in car_rows:
+            for name in ('brand_id', 'model_id', 'trim_id', 'year_id'):
+                row[name] = {'id': row[name][0], 'name': row[name][1]} if row[name] else None
+            row.update({'variants': [], 'key_specs': [], 'media': []})
+            rows_by_car[row['id']] = row
+        
+        # Variants and their effective prices
+        variant_rows = self.env['alromaih.car.variant'].search_read(
+            [('car_id', 'in', self.ids)],
+            ['car_id', 'name', 'seo_url_slug', 'color_id', 'price', 'is_primary', 'stock_status'],
+            order='car_id, sequence, id',
+        )
+        prices = {
+            row['variant_id'][0]: row for row in self.env['alromaih.car.variant.price'].search_read(
+                [('variant_id', 'in', [variant['id'] for variant in variant_rows])],
+                ['variant_id', 'offer_id', 'final_price', 'savings', 'valid_until'],
+            )
         }
+        for variant in variant_rows:
+            car_id = variant.pop('car_id')[0]
+            variant['color_id'] = {'id': variant['color_id'][0], 'name': variant['color_id'][1]} if variant['color_id'] else None
+            price = prices.get(variant['id'])
+            variant['effective_price'] = {
+                'final_price': price['final_price'],
+                'savings': price['savings'],
+                'offer_id': price['offer_id'][0] if price['offer_id'] else None,
+                'valid_until': price['valid_until'],
+            } if price else None
+            rows_by_car[car_id]['variants'].append(variant)
+        
+        # Public key specifications
+        if 'is_key_attribute' in self.env['product.attribute']._fields:
+            spec_rows = self.env['alromaih.car.specification'].search_read(
+                [('car_id', 'in', self.ids), ('is_public', '=', True), ('attribute_id.is_key_attribute', '=', True)],
+                ['car_id', 'attribute_id', 'display_value', 'value_numeric', 'value_is_numeric', 'value_unit'],
+            )
+            for spec in spec_rows:
+                rows_by_car[spec['car_id'][0]]['key_specs'].append({
+                    'attribute': spec['attribute_id'][1],
+                    'value': spec['display_value'],
+                    'value_numeric': spec['value_numeric'] if spec['value_is_numeric'] else None,
+                    'unit': spec['value_unit'] or None,
+                })
+        
+        # Public media, URLs resolved from the stored Bunny paths and one attachment lookup
+        Media = self.env['alromaih.car.media']
+        media_rows = Media.search_read(
+            [('car_id', 'in', self.ids), ('is_public', '=', True), ('website_visible', '=', True)],
+            ['car_id', 'media_type', 'content_type', 'alt_text', 'is_primary', 'bunny_image_path',
+             'bunny_video_path', 'bunny_document_path', 'video_url', 'external_link'],
+            order='car_id, sequence, id', load=None,
+        )
+        urls = Media._get_public_urls(media_rows)
+        for media in media_rows:
+            url = urls[media['id']]
+            if not url:
+                continue
+            rows_by_car[media['car_id']]['media'].append({
+                'id': media['id'],
+                'media_type': media['media_type'],
+                'content_type': media['content_type'],
+                'url': url,
+                'alt_text': media['alt_text'],
+                'is_primary': media['is_primary'],
+            })
+        
+        return [rows_by_car[car_id] for car_id in self.ids]
     
     @api.model
     def debug_car_creation(self):
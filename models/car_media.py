@@ -549,8 +549,9 @@ class CarMedia(models.Model):
     @api.depends('image', 'video_file', 'document_file', 'bunny_image_path', 'bunny_video_path', 'bunny_document_path')
     def _compute_external_url(self):
         """Compute Bunny CDN URLs for car media attachments (permanent for SEO)"""
+        config = self._get_bunny_config()
         for record in self:
-            record.external_url = self._get_bunny_cdn_url(record)
+            record.external_url = self._get_bunny_cdn_url(record, config)
     
     def _get_bunny_config(self):
         """Get Bunny Storage configuration from system parameters with default testing credentials"""
@@ -629,10 +630,10 @@ class CarMedia(models.Model):
                 _logger.error(f"Error uploading to Bunny Storage after retries: {e}")
                 return False
     
-    def _get_bunny_cdn_url(self, record):
+    def _get_bunny_cdn_url(self, record, config=None):
         """Generate Bunny CDN URL for car media (permanent, SEO-friendly)"""
         try:
-            config = self._get_bunny_config()
+            config = config or self._get_bunny_config()
             cdn_domain = config['cdn_domain']
             
             # Check Bunny Storage paths first (preferred)
@@ -986,6 +987,7 @@ class CarMedia(models.Model):
             if record.bunny_document_path:
                 record._delete_from_bunny_storage(record.bunny_document_path)
         
+        self.env['alromaih.catalog.tombstone']._record_deletion(self)
         return super().unlink()
     
     def _delete_from_bunny_storage(self, file_path):
@@ -1429,6 +1431,50 @@ class CarMedia(models.Model):
             _logger.error(f"Error generating CDN URL for media {record.id}: {e}")
             return False
     
+    @api.model
+    def _get_public_urls(self, rows):
+        """{media id: public URL} for search_read rows, without reading any binary.
+        
+        Applies the rules of _get_bunny_cdn_url/_get_cdn_url in batch: the Bunny
+        path of the content type first, then the filestore URL of the media's
+        attachment, all attachments being looked up with one search_read. Rows
+        need id, content_type, the bunny_*_path fields, video_url and external_link;
+        rows without a CDN URL fall back to video_url or external_link.
+        """
+        config = self._get_bunny_config()
+        cdn_domain = config['cdn_domain']
+        bunny_paths = {'image': 'bunny_image_path', 'video_file': 'bunny_video_path', 'document': 'bunny_document_path'}
+        urls = {}
+        for row in rows:
+            path_field = bunny_paths.get(row['content_type'])
+            if path_field and row[path_field]:
+                urls[row['id']] = f"https://{cdn_domain}/{row[path_field]}"
+        
+        fallback_ids = [row['id'] for row in rows if row['id'] not in urls]
+        if fallback_ids:
+            binary_fields = ['image', 'video_file', 'document_file']
+            attachments = {}
+            for attachment in self.env['ir.attachment'].sudo().search_read(
+                [('res_model', '=', self._name), ('res_id', 'in', fallback_ids), ('res_field', 'in', binary_fields)],
+                ['res_id', 'res_field', 'store_fname'],
+            ):
+                attachments.setdefault(attachment['res_id'], {})[attachment['res_field']] = attachment['store_fname']
+            dbname = self.env.cr.dbname
+            for media_id in fallback_ids:
+                by_field = attachments.get(media_id, {})
+                store_fname = next((by_field[name] for name in binary_fields if name in by_field), False)
+                if not store_fname:
+                    continue
+                if cdn_domain == 'alromaih-cdn.b-cdn.net':
+                    urls[media_id] = f"/web/image/alromaih.car.media/{media_id}/image"
+                else:
+                    urls[media_id] = f"https://{cdn_domain}/alromaih-odoo/filestore/{dbname}/{store_fname}"
+        
+        for row in rows:
+            if not urls.get(row['id']):
+                urls[row['id']] = row['video_url'] or row['external_link'] or False
+        return urls
+    
     def _find_media_attachment(self, record):
         """Find the ir.attachment record for this media record"""
         # Check which binary field has content and find corresponding attachment
@@ -1,5 +1,12 @@
 from odoo import api, fields, models, _
 from datetime import datetime, timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Offer fields that affect the effective price index of a variant
+PRICE_INDEX_FIELDS = ['car_variant_id', 'original_price', 'final_price', 'discount_type',
+                      'discount_value', 'start_date', 'end_date', 'is_active']
 
 
 class CarOffers(models.Model):
@@ -33,6 +40,8 @@ class CarOffers(models.Model):
     final_price = fields.Float(string='Final Price', compute='_compute_final_price', store=True)
     
     is_active = fields.Boolean(string='Active', compute='_compute_is_active', store=True)
+    fanout_pending = fields.Boolean(string='Variant Fan-out Pending', default=False, copy=False, index=True,
+                                    help="Variant offers for this campaign are being created in the background")
     
     offer_tag = fields.Selection([
         ('hot_deal', 'Hot Deal'),
@@ -60,12 +69,41 @@ class CarOffers(models.Model):
     @api.depends('original_price', 'discount_type', 'discount_value')
     def _compute_final_price(self):
         for rec in self:
-            if rec.discount_type == 'fixed':
-                rec.final_price = max(0, rec.original_price - rec.discount_value)
-            elif rec.discount_type == 'percentage':
-                rec.final_price = rec.original_price * (1 - (rec.discount_value / 100))
+            rec.final_price = rec._get_discounted_price(rec.original_price)
+    
+    def _get_discounted_price(self, original_price):
+        """Apply this offer's discount to a price"""
+        self.ensure_one()
+        if self.discount_type == 'fixed':
+            return max(0, original_price - self.discount_value)
+        elif self.discount_type == 'percentage':
+            return original_price * (1 - (self.discount_value / 100))
+        return original_price
+    
+    def _reprice(self):
+        """Refresh original and final prices from the current car/variant prices.
+        
+        Offers sharing the same new prices are written together; offers already
+        up to date are skipped. Returns the number of offers updated.
+        """
+        groups = {}
+        for offer in self:
+            if offer.car_variant_id:
+                original_price = offer.car_variant_id.price
+            elif offer.car_id:
+                original_price = offer.car_id.cash_price_with_vat
             else:
-                rec.final_price = rec.original_price
+                original_price = 0.0
+            final_price = offer._get_discounted_price(original_price)
+            if offer.original_price != original_price or offer.final_price != final_price:
+                groups.setdefault((original_price, final_price), []).append(offer.id)
+        
+        for (original_price, final_price), offer_ids in groups.items():
+            self.browse(offer_ids).write({
+                'original_price': original_price,
+                'final_price': final_price,
+            })
+        return sum(len(ids) for ids in groups.values())
     
     @api.depends('start_date', 'end_date')
     def _compute_is_active(self):
@@ -73,6 +111,44 @@ class CarOffers(models.Model):
         for rec in self:
             rec.is_active = (rec.start_date <= today <= rec.end_date) if rec.start_date and rec.end_date else False
     
+    @api.model
+    def _refresh_offer_activation(self, today=None):
+        """Flip is_active in one SQL pass for offers that crossed their start or end date.
+        
+        Only offers whose flag actually changes are touched; dependent stored fields
+        on their cars and variants are then marked for recomputation.
+        """
+        today = today or fields.Date.today()
+        self.flush_model(['start_date', 'end_date', 'is_active'])
+        self.env.cr.execute("""
+            UPDATE alromaih_car_offer
+               SET is_active = COALESCE(start_date <= %(today)s AND %(today)s <= end_date, FALSE),
+                   write_date = NOW() AT TIME ZONE 'UTC',
+                   write_uid = %(uid)s
+             WHERE is_active IS DISTINCT FROM COALESCE(start_date <= %(today)s AND %(today)s <= end_date, FALSE)
+         RETURNING id
+        """, {'today': today, 'uid': self.env.uid})
+        offer_ids = [row[0] for row in self.env.cr.fetchall()]
+        if not offer_ids:
+            return self.browse()
+        
+        offers = self.browse(offer_ids)
+        self.invalidate_model(['is_active', 'write_date', 'write_uid'])
+        # Cascade only to the cars/variants linked to the flipped offers
+        offers.modified(['is_active'])
+        offers.flush_recordset()
+        self.env.flush_all()
+        offers._refresh_variant_prices()
+        self.env['alromaih.dashboard.bus']._publish('offer_activated', offers.filtered('is_active').ids)
+        self.env['alromaih.dashboard.bus']._publish('offer_expired', offers.filtered(lambda o: not o.is_active).ids)
+        _logger.info("Offer activation: %d offers changed state for %s", len(offers), today)
+        return offers
+    
+    @api.model
+    def _cron_refresh_offer_activation(self):
+        """Scheduled entry point for the daily offer activation pass"""
+        self._refresh_offer_activation()
+    
     @api.depends('primary_banner_id', 'banner_media_ids')
     def _compute_banner_url(self):
         """Compute banner CDN URL from car media system"""
@@ -103,50 +179,115 @@ class CarOffers(models.Model):
         if self.apply_to_all_variants:
             self.car_variant_id = False
     
+    def _get_fanout_key(self, variant_id):
+        """Identity of a variant offer used to detect duplicates during fan-out"""
+        return (variant_id, self.start_date, self.end_date, self.discount_type, self.discount_value)
+    
     def _create_variant_offers(self):
         """Create offers for all variants if apply_to_all_variants is True"""
-        for offer in self.filtered(lambda o: o.apply_to_all_variants and o.car_id):
+        offers = self.filtered(lambda o: o.apply_to_all_variants and o.car_id)
+        if not offers:
+            return self.browse()
+        
+        variants = offers.mapped('car_id.variant_ids')
+        # Prefetch the keys of every existing variant offer in one query
+        existing_keys = set()
+        if variants:
+            for row in self.search_read(
+                [('car_variant_id', 'in', variants.ids)],
+                ['car_variant_id', 'start_date', 'end_date', 'discount_type', 'discount_value'],
+            ):
+                existing_keys.add((row['car_variant_id'][0], row['start_date'], row['end_date'],
+                                   row['discount_type'], row['discount_value']))
+        
+        vals_list = []
+        for offer in offers:
             car = offer.car_id
-            # For each variant, create an identical offer
             for variant in car.variant_ids:
-                # Skip if an offer already exists for this variant with the same dates
-                existing = self.search([
-                    ('car_variant_id', '=', variant.id),
-                    ('start_date', '=', offer.start_date),
-                    ('end_date', '=', offer.end_date),
-                    ('discount_type', '=', offer.discount_type),
-                    ('discount_value', '=', offer.discount_value)
-                ])
-                if not existing:
-                    self.create({
-                        'name': offer.name,
-                        'car_id': car.id,
-                        'car_variant_id': variant.id,
-                        'apply_to_all_variants': False,  # Individual variant offer
-                        'description': offer.description,
-                        'start_date': offer.start_date,
-                        'end_date': offer.end_date,
-                        'discount_type': offer.discount_type,
-                        'discount_value': offer.discount_value,
-                        'offer_tag': offer.offer_tag,
-                        # Note: Banner media will be linked separately if needed
-                    })
+                key = offer._get_fanout_key(variant.id)
+                if key in existing_keys:
+                    continue
+                existing_keys.add(key)
+                vals_list.append({
+                    'name': offer.name,
+                    'car_id': car.id,
+                    'car_variant_id': variant.id,
+                    'apply_to_all_variants': False,  # Individual variant offer
+                    'description': offer.description,
+                    'start_date': offer.start_date,
+                    'end_date': offer.end_date,
+                    'discount_type': offer.discount_type,
+                    'discount_value': offer.discount_value,
+                    'offer_tag': offer.offer_tag,
+                    # Note: Banner media will be linked separately if needed
+                })
+        
+        return self.create(vals_list) if vals_list else self.browse()
+    
+    def _schedule_variant_offers(self):
+        """Fan out offers inline, or defer large campaigns to the background job"""
+        offers = self.filtered(lambda o: o.apply_to_all_variants and o.car_id)
+        if not offers:
+            return
+        limit = int(self.env['ir.config_parameter'].sudo().get_param(
+            'alromaih_cars_dash.offer_fanout_sync_limit', 50))
+        if len(offers.mapped('car_id.variant_ids')) <= limit:
+            offers._create_variant_offers()
+            return
+        
+        offers.write({'fanout_pending': True})
+        cron = self.env.ref('alromaih_cars_dash.ir_cron_offer_variant_fanout', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+        else:
+            offers._create_variant_offers()
+            offers.write({'fanout_pending': False})
     
     @api.model
-    def create(self, vals):
-        offer = super(CarOffers, self).create(vals)
-        if offer.apply_to_all_variants:
-            offer._create_variant_offers()
-        return offer
+    def _cron_process_variant_fanout(self, batch_size=100):
+        """Background job creating variant offers for large campaigns"""
+        pending = self.search([('fanout_pending', '=', True)], limit=batch_size)
+        if not pending:
+            return
+        created = pending._create_variant_offers()
+        pending.write({'fanout_pending': False})
+        _logger.info("Offer fan-out: created %d variant offers for %d campaign offers", len(created), len(pending))
+        if self.search_count([('fanout_pending', '=', True)]):
+            self.env.ref('alromaih_cars_dash.ir_cron_offer_variant_fanout')._trigger()
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        offers = super(CarOffers, self).create(vals_list)
+        offers._schedule_variant_offers()
+        offers._refresh_variant_prices()
+        return offers
     
     def write(self, vals):
+        price_fields_changed = any(field in vals for field in PRICE_INDEX_FIELDS)
+        old_variants = self.mapped('car_variant_id') if 'car_variant_id' in vals else self.env['alromaih.car.variant']
         result = super(CarOffers, self).write(vals)
         # If updating relevant fields and apply_to_all_variants is True
         if any(field in vals for field in ['discount_type', 'discount_value', 'start_date', 'end_date', 'apply_to_all_variants']):
-            for offer in self.filtered(lambda o: o.apply_to_all_variants):
-                offer._create_variant_offers()
+            self._schedule_variant_offers()
+        if price_fields_changed:
+            self._refresh_variant_prices(old_variants)
         return result
     
+    def unlink(self):
+        variants = self.mapped('car_variant_id')
+        self.env['alromaih.catalog.tombstone']._record_deletion(self)
+        result = super(CarOffers, self).unlink()
+        self.env['alromaih.car.variant.price']._refresh_variants(variants.ids)
+        return result
+    
+    def _refresh_variant_prices(self, extra_variants=None):
+        """Update the effective price index for the variants these offers apply to"""
+        variants = self.mapped('car_variant_id')
+        if extra_variants:
+            variants |= extra_variants
+        if variants:
+            self.env['alromaih.car.variant.price']._refresh_variants(variants.ids)
+    
     # ============================================================================
     # CAR MEDIA SYSTEM INTEGRATION METHODS
     # ============================================================================
@@ -0,0 +1,170 @@
+from odoo import api, fields, models, tools, _
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Specification fields that change the facet rows of a spec
+FACET_SOURCE_FIELDS = ['car_id', 'attribute_id', 'attribute_value_id', 'attribute_value_ids',
+                       'custom_value', 'active', 'is_public']
+
+
+class CarSpecFacet(models.Model):
+    _name = 'alromaih.car.spec.facet'
+    _description = _('Car Specification Facet')
+    _log_access = False
+    _order = 'car_id, attribute_id'
+
+    spec_id = fields.Many2one('alromaih.car.specification', string='Specification', required=True,
+                              ondelete='cascade', index=True, readonly=True)
+    car_id = fields.Many2one('alromaih.car', string='Car', required=True, ondelete='cascade', readonly=True)
+    attribute_id = fields.Many2one('product.attribute', string='Attribute', required=True,
+                                   ondelete='cascade', readonly=True)
+    value_id = fields.Many2one('product.attribute.value', string='Value', ondelete='cascade', readonly=True)
+    value_num = fields.Float(string='Numeric Value', readonly=True,
+                             help="Number extracted from the specification value for range filters")
+
+    def init(self):
+        tools.create_index(self.env.cr, 'alromaih_car_spec_facet_attr_value_car_idx',
+                           self._table, ['attribute_id', 'value_id', 'car_id'])
+        tools.create_index(self.env.cr, 'alromaih_car_spec_facet_attr_num_car_idx',
+                           self._table, ['attribute_id', 'value_num', 'car_id'],
+                           where='value_num IS NOT NULL')
+        tools.create_index(self.env.cr, 'alromaih_car_spec_facet_car_idx',
+                           self._table, ['car_id', 'attribute_id', 'value_id'])
+        # Populate the index once for databases that already have specifications
+        # (deferred to the next update while the specification columns are being created)
+        if not tools.column_exists(self.env.cr, 'alromaih_car_specification', 'value_is_numeric'):
+            return
+        self.env.cr.execute("SELECT 1 FROM alromaih_car_spec_facet LIMIT 1")
+        if not self.env.cr.fetchone():
+            self.env.cr.execute("SELECT id FROM alromaih_car_specification")
+            spec_ids = [row[0] for row in self.env.cr.fetchall()]
+            if spec_ids:
+                self._sync_specs(spec_ids)
+
+    @api.model
+    def _sync_specs(self, spec_ids):
+        """Rebuild the facet rows of the given specifications with one DELETE and one INSERT.
+
+        Each active public spec yields one row per selected value, or a single row
+        without value for custom values; value_num mirrors the spec's value_numeric
+        and is NULL when the spec has no number.
+        """
+        spec_ids = list(set(spec_ids))
+        if not spec_ids:
+            return
+        Specification = self.env['alromaih.car.specification']
+        Specification.flush_model()
+        values_field = Specification._fields['attribute_value_ids']
+
+        self.env.cr.execute("DELETE FROM alromaih_car_spec_facet WHERE spec_id = ANY(%s)", [spec_ids])
+        self.env.cr.execute(f"""
+            INSERT INTO alromaih_car_spec_facet (spec_id, car_id, attribute_id, value_id, value_num)
+            SELECT s.id, s.car_id, s.attribute_id, v.value_id,
+                   CASE WHEN s.value_is_numeric THEN s.value_numeric END
+              FROM alromaih_car_specification s
+         LEFT JOIN LATERAL (
+                   SELECT s.attribute_value_id AS value_id
+                    WHERE s.attribute_value_id IS NOT NULL
+                   UNION
+                   SELECT r.{values_field.column2}
+                     FROM {values_field.relation} r
+                    WHERE r.{values_field.column1} = s.id
+                   ) v ON TRUE
+             WHERE s.id = ANY(%s) AND s.active AND s.is_public AND s.car_id IS NOT NULL
+        """, [spec_ids])
+        self.invalidate_model()
+
+    @api.model
+    def action_rebuild_facet_index(self):
+        """Rebuild the facet index for every specification"""
+        self.env.cr.execute("SELECT id FROM alromaih_car_specification")
+        spec_ids = [row[0] for row in self.env.cr.fetchall()]
+        self._sync_specs(spec_ids)
+        _logger.info("Specification facet index rebuilt from %d specifications", len(spec_ids))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Facet Index Rebuilt'),
+                'message': _('Indexed %d specifications.') % len(spec_ids),
+                'type': 'success',
+            }
+        }
+
+    @api.model
+    def search_cars(self, filters=None, facet_attribute_ids=None, status=None, limit=20, offset=0):
+        """Faceted car search answered with a single query.
+
+        filters: list of dicts {'attribute_id': id, 'value_ids': [ids]} and/or
+        {'attribute_id': id, 'min': x, 'max': y}; all filters must match.
+        Returns the matching car ids (paged), the total and per-facet counts:
+        {'car_ids': [...], 'total': n, 'facets': {attribute_id: {value_id: count}},
+        'ranges': {attribute_id: {'min': x, 'max': y}}}.
+        """
+        conditions = ['c.active']
+        params = {'limit': limit, 'offset': offset}
+        if status:
+            conditions.append('c.status = %(status)s')
+            params['status'] = status
+
+        for index, spec_filter in enumerate(filters or []):
+            key = f'f{index}'
+            clauses = ['f.car_id = c.id', f'f.attribute_id = %({key}_attr)s']
+            params[f'{key}_attr'] = int(spec_filter['attribute_id'])
+            if spec_filter.get('value_ids'):
+                clauses.append(f'f.value_id = ANY(%({key}_values)s)')
+                params[f'{key}_values'] = [int(value_id) for value_id in spec_filter['value_ids']]
+            if spec_filter.get('min') is not None:
+                clauses.append(f'f.value_num >= %({key}_min)s')
+                params[f'{key}_min'] = float(spec_filter['min'])
+            if spec_filter.get('max') is not None:
+                clauses.append(f'f.value_num <= %({key}_max)s')
+                params[f'{key}_max'] = float(spec_filter['max'])
+            conditions.append(f"EXISTS (SELECT 1 FROM alromaih_car_spec_facet f WHERE {' AND '.join(clauses)})")
+
+        facet_condition = ''
+        if facet_attribute_ids:
+            facet_condition = 'AND f.attribute_id = ANY(%(facet_attributes)s)'
+            params['facet_attributes'] = [int(attribute_id) for attribute_id in facet_attribute_ids]
+
+        self.env['alromaih.car'].flush_model(['active', 'status', 'sequence'])
+        self.env.cr.execute(f"""
+            WITH matched AS (
+                SELECT c.id, c.sequence
+                  FROM alromaih_car c
+                 WHERE {' AND '.join(conditions)}
+            )
+            (SELECT 'car' AS kind, id AS ref, NULL::integer AS value_id, NULL::bigint AS total,
+                    NULL::float AS lo, NULL::float AS hi
+               FROM matched
+           ORDER BY sequence, id
+              LIMIT %(limit)s OFFSET %(offset)s)
+            UNION ALL
+            SELECT 'total', NULL, NULL, COUNT(*), NULL, NULL
+              FROM matched
+            UNION ALL
+            SELECT 'facet', f.attribute_id, f.value_id, COUNT(DISTINCT f.car_id), NULL, NULL
+              FROM alromaih_car_spec_facet f
+              JOIN matched m ON m.id = f.car_id
+             WHERE f.value_id IS NOT NULL {facet_condition}
+          GROUP BY f.attribute_id, f.value_id
+            UNION ALL
+            SELECT 'range', f.attribute_id, NULL, COUNT(DISTINCT f.car_id), MIN(f.value_num), MAX(f.value_num)
+              FROM alromaih_car_spec_facet f
+              JOIN matched m ON m.id = f.car_id
+             WHERE f.value_num IS NOT NULL {facet_condition}
+          GROUP BY f.attribute_id
+        """, params)
+
+        result = {'car_ids': [], 'total': 0, 'facets': {}, 'ranges': {}}
+        for kind, ref, value_id, total, lo, hi in self.env.cr.fetchall():
+            if kind == 'car':
+                result['car_ids'].append(ref)
+            elif kind == 'total':
+                result['total'] = total
+            elif kind == 'facet':
+                result['facets'].setdefault(ref, {})[value_id] = total
+            else:
+                result['ranges'][ref] = {'min': lo, 'max': hi, 'count': total}
+        return result
@@ -1,5 +1,64 @@
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import ValidationError
+from .car_spec_facet import FACET_SOURCE_FIELDS
+import logging
+import re
+
+_logger = logging.getLogger(__name__)
+
+# Numeric extraction from specification values ("250 hp", "٧ مقاعد", "2,500 cc")
+ARABIC_DIGITS = str.maketrans('٠١٢٣٤٥٦٧٨٩٫٬', '0123456789.,')
+THOUSANDS_SEPARATOR_RE = re.compile(r'(?<=\d),(?=\d{3}\b)')
+# A leading minus only counts when it is not glued to a word ("V-6" is 6, "-5" is -5)
+NUMBER_RE = re.compile(r'(?:(?<!\w)-)?\d+(?:[.,]\d+)?')
+# "5-7 seats", "180 to 200 hp": the value is the lower bound, the unit follows the upper one
+RANGE_RE = re.compile(r'\s*(?:-|–|~|to|إلى|الى)\s*(\d+(?:[.,]\d+)?)', re.IGNORECASE)
+# "0-100 km/h in 7.5 s": the measured value comes after the acceleration prefix
+ACCELERATION_PREFIX_RE = re.compile(
+    r'^\s*0\s*[-–]\s*(?:100|60)\s*(?:km/h|kph|mph|كم/س(?:اعة)?)?\s*(?:in|في|:)?\s*', re.IGNORECASE)
+UNIT_ALIASES = {
+    'hp': 'hp', 'bhp': 'hp', 'horsepower': 'hp', 'حصان': 'hp',
+    'ps': 'ps',
+    'kw': 'kw', 'كيلوواط': 'kw',
+    'nm': 'nm', 'n.m': 'nm', 'n·m': 'nm', 'نيوتن متر': 'nm', 'نيوتن.متر': 'nm',
+    'cc': 'cc', 'cm3': 'cc', 'سي سي': 'cc',
+    'l': 'l', 'liter': 'l', 'litre': 'l', 'liters': 'l', 'litres': 'l', 'لتر': 'l',
+    'km/l': 'km/l', 'kmpl': 'km/l', 'كم/لتر': 'km/l', 'كم/ل': 'km/l',
+    'l/100km': 'l/100km', 'لتر/100كم': 'l/100km',
+    'km/h': 'km/h', 'kph': 'km/h', 'كم/س': 'km/h', 'كم/ساعة': 'km/h',
+    'km': 'km', 'كم': 'km',
+    'mm': 'mm', 'ملم': 'mm', 'مم': 'mm',
+    'kg': 'kg', 'كجم': 'kg', 'كغ': 'kg',
+    's': 's', 'sec': 's', 'seconds': 's', 'ثانية': 's', 'ثواني': 's',
+    'in': 'in', 'inch': 'in', 'inches': 'in', '"': 'in', 'بوصة': 'in', 'انش': 'in',
+    'seat': 'seats', 'seats': 'seats', 'seater': 'seats', 'مقعد': 'seats', 'مقاعد': 'seats', 'راكب': 'seats',
+    'door': 'doors', 'doors': 'doors', 'باب': 'doors', 'أبواب': 'doors', 'ابواب': 'doors',
+    'speed': 'speed', 'speeds': 'speed', 'سرعات': 'speed',
+    'cyl': 'cylinders', 'cylinder': 'cylinders', 'cylinders': 'cylinders', 'سلندر': 'cylinders', 'أسطوانات': 'cylinders',
+}
+
+
+def parse_numeric_value(text):
+    """Extract (number, normalized unit) from a specification value, or (None, False)"""
+    if not text:
+        return None, False
+    text = THOUSANDS_SEPARATOR_RE.sub('', text.translate(ARABIC_DIGITS))
+    prefix = ACCELERATION_PREFIX_RE.match(text)
+    if prefix and NUMBER_RE.search(text, prefix.end()):
+        text = text[prefix.end():]
+    match = NUMBER_RE.search(text)
+    if not match:
+        return None, False
+    number = float(match.group().replace(',', '.'))
+    end = match.end()
+    range_match = RANGE_RE.match(text, end)
+    if range_match:
+        end = range_match.end()
+    unit_text = text[end:].strip().lower()
+    unit = UNIT_ALIASES.get(unit_text)
+    if not unit and unit_text:
+        unit = UNIT_ALIASES.get(unit_text.split()[0], False)
+    return number, unit or False
 
 
 class CarSpecificationTemplate(models.Model):
@@ -335,47 +394,144 @@ class CarSpecification(models.Model):
     display_value = fields.Char(string='Display Value', 
                               compute='_compute_display_value', store=True)
     
+    # Numeric normalization for range filters and sorting
+    value_numeric = fields.Float(string='Numeric Value', compute='_compute_value_numeric', store=True,
+                                 help="Number parsed from the display value, meaningful only when "
+                                      "Has Numeric Value is set")
+    value_is_numeric = fields.Boolean(string='Has Numeric Value', compute='_compute_value_numeric', store=True,
+                                      help="The display value contains a number (which may be 0)")
+    value_unit = fields.Char(string='Unit', compute='_compute_value_numeric', store=True,
+                             help="Normalized unit parsed from the display value")
+    
+    def init(self):
+        tools.create_index(self.env.cr, 'alromaih_car_specification_attr_numeric_idx',
+                           self._table, ['attribute_id', 'value_numeric'],
+                           where='value_is_numeric')
+    
+    @api.depends('display_value', 'display_type')
+    def _compute_value_numeric(self):
+        for spec in self:
+            number, unit = (None, False) if spec.display_type == 'multi' else parse_numeric_value(spec.display_value)
+            spec.value_is_numeric = number is not None
+            spec.value_numeric = number or 0.0
+            spec.value_unit = unit
+    
+    @api.model
+    def action_backfill_numeric_values(self, batch_size=2000):
+        """Re-parse numeric values and units of all specifications in chunks"""
+        spec_ids = self.with_context(active_test=False).search([], order='id').ids
+        numeric_fields = [self._fields['value_numeric'], self._fields['value_is_numeric'], self._fields['value_unit']]
+        for start in range(0, len(spec_ids), batch_size):
+            specs = self.browse(spec_ids[start:start + batch_size])
+            for field in numeric_fields:
+                self.env.add_to_compute(field, specs)
+            specs.flush_recordset(['value_numeric', 'value_is_numeric', 'value_unit'])
+            self.env.invalidate_all()
+            _logger.info("Specification numeric backfill: %d/%d", min(start + batch_size, len(spec_ids)), len(spec_ids))
+        
+        self.env['alromaih.car.spec.facet']._sync_specs(spec_ids)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Numeric Values Updated'),
+                'message': _('Parsed numeric values for %d specifications.') % len(spec_ids),
+                'type': 'success',
+            }
+        }
+    
+    @api.model
+    def search_numeric_range(self, attribute_id, min_value=None, max_value=None, unit=None):
+        """Specifications of an attribute whose numeric value lies in [min_value, max_value]"""
+        domain = [('attribute_id', '=', attribute_id), ('value_is_numeric', '=', True)]
+        if min_value is not None:
+            domain.append(('value_numeric', '>=', min_value))
+        if max_value is not None:
+            domain.append(('value_numeric', '<=', max_value))
+        if unit:
+            domain.append(('value_unit', '=', UNIT_ALIASES.get(unit.lower(), unit)))
+        return self.search(domain)
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        specifications = super().create(vals_list)
+        self.env['alromaih.car.spec.facet']._sync_specs(specifications.ids)
+        return specifications
+    
+    def write(self, vals):
+        result = super().write(vals)
+        # Keep the facet index in line with the values used for catalog filtering
+        if any(field in vals for field in FACET_SOURCE_FIELDS):
+            self.env['alromaih.car.spec.facet']._sync_specs(self.ids)
+        return result
+    
     @api.model
     def create_from_template(self, car_id, template_id, variant_id=None):
-        """Create specifications for a car based on a template"""
+        """Create specifications for one or many cars based on a template.
+        
+        car_id may be a single id or a list of ids; all specifications are
+        created with a single multi-create.
+        """
         template = self.env['alromaih.car.specification.template'].browse(template_id)
         if not template.exists():
             return False
         
-        specifications = []
-        for line in template.specification_line_ids:
+        car_ids = car_id if isinstance(car_id, (list, tuple)) else [car_id]
+        line_vals = self._prepare_template_line_vals(template)
+        
+        specifications = [
+            dict(vals, car_id=cid, car_variant_id=variant_id)
+            for cid in car_ids
+            for vals in line_vals
+        ]
+        return self.create(specifications)
+    
+    @api.model
+    def _prepare_template_line_vals(self, template):
+        """Car-independent specification values for every line of a template"""
+        lines = template.specification_line_ids
+        
+        # First available value of every attribute lacking a default, in one query
+        first_values = self._get_first_attribute_values(
+            lines.filtered(lambda l: not l.default_value_id).mapped('attribute_id').ids
+        )
+        
+        line_vals = []
+        for line in lines:
             vals = {
-                'car_id': car_id,
-                'car_variant_id': variant_id,
                 'attribute_id': line.attribute_id.id,
                 'sequence': line.sequence,
                 'is_public': line.is_visible,
             }
             
-            # Set default value based on display type
-            if line.default_value_id:
+            # Set default value based on display type, falling back to the first available value
+            value_id = line.default_value_id.id or first_values.get(line.attribute_id.id)
+            if value_id:
                 if line.attribute_id.display_type == 'multi':
-                    vals['attribute_value_ids'] = [(6, 0, [line.default_value_id.id])]
+                    vals['attribute_value_ids'] = [(6, 0, [value_id])]
                 else:
-                    vals['attribute_value_id'] = line.default_value_id.id
+                    vals['attribute_value_id'] = value_id
             else:
-                # Find first available value for this attribute or set as custom
-                available_values = self.env['product.attribute.value'].search([
-                    ('attribute_id', '=', line.attribute_id.id)
-                ], limit=1)
-                
-                if available_values:
-                    if line.attribute_id.display_type == 'multi':
-                        vals['attribute_value_ids'] = [(6, 0, [available_values.id])]
-                    else:
-                        vals['attribute_value_id'] = available_values.id
-                else:
-                    # No predefined values available, set meaningful default custom value
-                    vals['custom_value'] = 'Not specified'
+                # No predefined values available, set meaningful default custom value
+                vals['custom_value'] = 'Not specified'
             
-            specifications.append(vals)
+            line_vals.append(vals)
         
-        return self.create(specifications)
+        return line_vals
+    
+    @api.model
+    def _get_first_attribute_values(self, attribute_ids):
+        """Map attribute id -> id of its first active value (by sequence), in one query"""
+        if not attribute_ids:
+            return {}
+        self.env['product.attribute.value'].flush_model(['attribute_id', 'sequence', 'active'])
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (attribute_id) attribute_id, id
+              FROM product_attribute_value
+             WHERE attribute_id = ANY(%s) AND active
+          ORDER BY attribute_id, sequence, id
+        """, [list(attribute_ids)])
+        return dict(self.env.cr.fetchall())
     
     def get_selected_value_ids(self):
         """Get all selected value IDs regardless of display type"""
@@ -1,13 +1,24 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Quantity fields kept in sync with stock by _sync_inventory_quantities()
+INVENTORY_QTY_FIELDS = ['qty_available', 'qty_forecasted', 'virtual_available', 'incoming_qty', 'outgoing_qty']
 
 
 class CarVariant(models.Model):
     _name = 'alromaih.car.variant'
     _description = _('Car Variant')
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'alromaih.search.mixin']
     _order = 'sequence, id'
     
+    # Full-text search index
+    _search_title_field = 'name'
+    _search_body_fields = ['description', 'meta_description', 'meta_keywords']
+    _search_slug_field = 'seo_url_slug'
+    
     name = fields.Char(string='Name', compute='_compute_name', store=True, translate=True)
     description = fields.Html(string='Variant Description', translate=True,
                              help="Rich text description for SEO and marketing purposes")
@@ -255,6 +266,127 @@ class CarVariant(models.Model):
             else:
                 rec.stock_status = 'in_stock'
     
+    def _fetch_stock_quantities(self, product_ids):
+        """Read on-hand, reserved, incoming and outgoing quantities for many products in one query"""
+        if not product_ids:
+            return {}
+        
+        self.env['stock.quant'].flush_model(['product_id', 'location_id', 'quantity', 'reserved_quantity'])
+        self.env['stock.move'].flush_model(['product_id', 'location_id', 'location_dest_id', 'product_qty', 'state'])
+        self.env.cr.execute("""
+            WITH quants AS (
+                SELECT q.product_id,
+                       SUM(q.quantity) AS quantity,
+                       SUM(q.reserved_quantity) AS reserved
+                  FROM stock_quant q
+                  JOIN stock_location l ON l.id = q.location_id
+                 WHERE q.product_id = ANY(%(product_ids)s)
+                   AND l.usage = 'internal'
+              GROUP BY q.product_id
+            ), moves AS (
+                SELECT m.product_id,
+                       SUM(CASE WHEN ld.usage = 'internal' AND ls.usage != 'internal'
+                                THEN m.product_qty ELSE 0 END) AS incoming,
+                       SUM(CASE WHEN ls.usage = 'internal' AND ld.usage != 'internal'
+                                THEN m.product_qty ELSE 0 END) AS outgoing
+                  FROM stock_move m
+                  JOIN stock_location ls ON ls.id = m.location_id
+                  JOIN stock_location ld ON ld.id = m.location_dest_id
+                 WHERE m.product_id = ANY(%(product_ids)s)
+                   AND m.state NOT IN ('draft', 'cancel', 'done')
+              GROUP BY m.product_id
+            )
+            SELECT p.id,
+                   COALESCE(q.quantity, 0),
+                   COALESCE(q.reserved, 0),
+                   COALESCE(m.incoming, 0),
+                   COALESCE(m.outgoing, 0)
+              FROM unnest(%(product_ids)s) AS p(id)
+         LEFT JOIN quants q ON q.product_id = p.id
+         LEFT JOIN moves m ON m.product_id = p.id
+        """, {'product_ids': list(product_ids)})
+        
+        quantities = {}
+        for product_id, quantity, reserved, incoming, outgoing in self.env.cr.fetchall():
+            quantities[product_id] = {
+                'qty_available': quantity,
+                'qty_forecasted': quantity - reserved,
+                'virtual_available': quantity + incoming - outgoing,
+                'incoming_qty': incoming,
+                'outgoing_qty': outgoing,
+            }
+        return quantities
+    
+    def _sync_inventory_quantities(self):
+        """Refresh stored inventory quantities from stock and write only the variants that changed.
+        
+        Variants sharing the same new quantities are written together, so the
+        stock_status recomputation is triggered once per group instead of once
+        per variant.
+        """
+        if 'stock.quant' not in self.env or not self:
+            return 0
+        
+        self.flush_recordset(INVENTORY_QTY_FIELDS + ['product_variant_id'])
+        self.env.cr.execute("""
+            SELECT id, product_variant_id, qty_available, qty_forecasted,
+                   virtual_available, incoming_qty, outgoing_qty
+              FROM alromaih_car_variant
+             WHERE id = ANY(%s) AND product_variant_id IS NOT NULL
+        """, [self.ids])
+        stored_rows = self.env.cr.fetchall()
+        
+        quantities = self._fetch_stock_quantities({row[1] for row in stored_rows})
+        
+        # Group variants by their new values, skipping the ones already up to date
+        changed = {}
+        for variant_id, product_id, *stored in stored_rows:
+            new_values = quantities.get(product_id)
+            if not new_values:
+                continue
+            old_values = dict(zip(INVENTORY_QTY_FIELDS, (value or 0.0 for value in stored)))
+            if all(abs(new_values[fname] - old_values[fname]) < 1e-6 for fname in INVENTORY_QTY_FIELDS):
+                continue
+            key = tuple(new_values[fname] for fname in INVENTORY_QTY_FIELDS)
+            changed.setdefault(key, []).append(variant_id)
+        
+        # Variants have no sale state: a drop of on-hand quantity is reported as sold units
+        sold_ids = [
+            variant_id for variant_id, product_id, *stored in stored_rows
+            if product_id in quantities and quantities[product_id]['qty_available'] < (stored[0] or 0.0) - 1e-6
+        ]
+        self.env['alromaih.dashboard.bus']._publish('variant_sold', sold_ids)
+        
+        updated_count = 0
+        variants = self.with_context(tracking_disable=True)
+        for key, variant_ids in changed.items():
+            variants.browse(variant_ids).write(dict(zip(INVENTORY_QTY_FIELDS, key)))
+            updated_count += len(variant_ids)
+        
+        _logger.info("Inventory sync: %d of %d mapped variants updated", updated_count, len(stored_rows))
+        return updated_count
+    
+    @api.model
+    def _cron_sync_inventory_quantities(self):
+        """Scheduled job: refresh stock quantities for every variant linked to a product"""
+        variants = self.with_context(active_test=False).search([('product_variant_id', '!=', False)])
+        return variants._sync_inventory_quantities()
+    
+    def action_sync_inventory_quantities(self):
+        """Manual action to refresh stock quantities for the selected variants (or all mapped ones)"""
+        variants = self or self.with_context(active_test=False).search([('product_variant_id', '!=', False)])
+        updated_count = variants._sync_inventory_quantities()
+        
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Inventory Synchronized'),
+                'message': _('Updated stock quantities for %d variants.') % updated_count,
+                'type': 'success',
+            }
+        }
+    
     @api.depends('media_ids')
     def _compute_media_count(self):
         """Compute total media count for this variant"""
@@ -318,7 +450,8 @@ class CarVariant(models.Model):
                 variant.write(auto_fields_to_update)
             
             # Handle primary variant logic based on color relationship
-            if variant.car_id:
+            # (skipped when the caller reconciles primary flags for many cars at once)
+            if variant.car_id and not self.env.context.get('alromaih_skip_primary_sync'):
                 # If this variant's color is the car's primary color, set it as primary
                 if (variant.car_id.primary_color_id and 
                     variant.color_id.id == variant.car_id.primary_color_id.id):
@@ -343,12 +476,14 @@ class CarVariant(models.Model):
             # Auto-map to existing product if not already linked
             if not variant.product_variant_id:
                 variant._auto_map_to_product()
+        
+        self.env['alromaih.car.variant.price']._refresh_variants(variants.ids)
                 
         return variants
     
     def write(self, vals):
         """Handle primary variant changes and auto-mapping when attributes change"""
-        if 'is_primary' in vals and vals['is_primary']:
+        if 'is_primary' in vals and vals['is_primary'] and not self.env.context.get('alromaih_skip_primary_sync'):
             # If setting this variant as primary, unset others
             for variant in self.filtered(lambda v: v.car_id):
                 car = variant.car_id
@@ -359,6 +494,13 @@ class CarVariant(models.Model):
         
         result = super().write(vals)
         
+        # Manual price changes reprice this variant's offers
+        if 'price' in vals and not self.env.context.get('alromaih_skip_price_propagation'):
+            self.offer_ids._reprice()
+        
+        if 'price' in vals or 'car_id' in vals:
+            self.env['alromaih.car.variant.price']._refresh_variants(self.ids)
+        
         # Check if any attributes that affect product mapping have changed
         mapping_fields = ['car_id', 'color_id']
         if any(field in vals for field in mapping_fields):
@@ -369,6 +511,9 @@ class CarVariant(models.Model):
         
         return result
     
+    def _is_search_public(self):
+        return set(self.filtered(lambda v: v.car_id.status == 'published').ids)
+    
     def action_set_as_primary(self):
         """Set this variant as the primary one"""
         self.ensure_one()
@@ -1093,4 +1238,5 @@ class CarVariant(models.Model):
         """Prevent deletion if there are related offers or media records"""
         if self.offer_ids or self.media_ids:
             raise UserError(_("Cannot delete this variant as it is linked to offers or media records."))
+        self.env['alromaih.catalog.tombstone']._record_deletion(self)
         super().unlink()
\ No newline at end of file
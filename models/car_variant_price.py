@@ -0,0 +1,147 @@
+from odoo import api, fields, models, _
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class CarVariantPrice(models.Model):
+    _name = 'alromaih.car.variant.price'
+    _description = _('Car Variant Effective Price')
+    _order = 'final_price, variant_id'
+    _rec_name = 'variant_id'
+
+    variant_id = fields.Many2one('alromaih.car.variant', string='Variant', required=True,
+                                 ondelete='cascade', readonly=True)
+    car_id = fields.Many2one('alromaih.car', string='Car', index=True, readonly=True)
+    base_price = fields.Float(string='Base Price', digits=(16, 2), readonly=True)
+    offer_id = fields.Many2one('alromaih.car.offer', string='Best Active Offer', ondelete='set null', readonly=True)
+    final_price = fields.Float(string='Final Price', digits=(16, 2), index=True, readonly=True,
+                               help="Price the customer pays now: the best active offer price, or the base price")
+    savings = fields.Float(string='Savings', digits=(16, 2), readonly=True)
+    valid_until = fields.Date(string='Valid Until', readonly=True,
+                              help="End date of the best active offer")
+
+    _sql_constraints = [
+        ('variant_uniq', 'unique(variant_id)', 'Only one effective price row is allowed per variant.'),
+    ]
+
+    def init(self):
+        # Backfill once for databases that already have variants when the table is created
+        self.env.cr.execute("SELECT 1 FROM alromaih_car_variant_price LIMIT 1")
+        if not self.env.cr.fetchone():
+            self.env.cr.execute("SELECT id FROM alromaih_car_variant")
+            variant_ids = [row[0] for row in self.env.cr.fetchall()]
+            if variant_ids:
+                self._refresh_variants(variant_ids)
+
+    @api.model
+    def _refresh_variants(self, variant_ids):
+        """Upsert the effective price rows of the given variants in one SQL statement.
+
+        The best offer is the active variant offer with the lowest final price,
+        matching CarVariant._compute_active_offer. Rows are only rewritten when a
+        value actually changes.
+        """
+        variant_ids = list(set(variant_ids))
+        if not variant_ids:
+            return
+        # Make pending price/offer computations visible to SQL
+        self.env['alromaih.car.variant'].flush_model(['price', 'car_id'])
+        self.env['alromaih.car.offer'].flush_model(['car_variant_id', 'is_active', 'final_price', 'end_date'])
+
+        self.env.cr.execute("""
+            INSERT INTO alromaih_car_variant_price
+                   (variant_id, car_id, base_price, offer_id, final_price, savings, valid_until,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT v.id,
+                   v.car_id,
+                   COALESCE(v.price, 0),
+                   o.id,
+                   COALESCE(o.final_price, v.price, 0),
+                   GREATEST(COALESCE(v.price, 0) - COALESCE(o.final_price, v.price, 0), 0),
+                   o.end_date,
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM alromaih_car_variant v
+         LEFT JOIN LATERAL (
+                   SELECT id, final_price, end_date
+                     FROM alromaih_car_offer
+                    WHERE car_variant_id = v.id AND is_active
+                 ORDER BY final_price, id
+                    LIMIT 1
+                   ) o ON TRUE
+             WHERE v.id = ANY(%(variant_ids)s)
+       ON CONFLICT (variant_id) DO UPDATE
+               SET car_id = EXCLUDED.car_id,
+                   base_price = EXCLUDED.base_price,
+                   offer_id = EXCLUDED.offer_id,
+                   final_price = EXCLUDED.final_price,
+                   savings = EXCLUDED.savings,
+                   valid_until = EXCLUDED.valid_until,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+             WHERE (alromaih_car_variant_price.car_id, alromaih_car_variant_price.base_price,
+                    alromaih_car_variant_price.offer_id, alromaih_car_variant_price.final_price,
+                    alromaih_car_variant_price.valid_until)
+                   IS DISTINCT FROM
+                   (EXCLUDED.car_id, EXCLUDED.base_price, EXCLUDED.offer_id,
+                    EXCLUDED.final_price, EXCLUDED.valid_until)
+        """, {'variant_ids': variant_ids, 'uid': self.env.uid})
+        self.invalidate_model()
+
+    @api.model
+    def action_rebuild_price_index(self):
+        """Recompute the effective price of every variant"""
+        self.env.cr.execute("SELECT id FROM alromaih_car_variant")
+        variant_ids = [row[0] for row in self.env.cr.fetchall()]
+        self._refresh_variants(variant_ids)
+        _logger.info("Effective price index rebuilt for %d variants", len(variant_ids))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Price Index Rebuilt'),
+                'message': _('Effective prices refreshed for %d variants.') % len(variant_ids),
+                'type': 'success',
+            }
+        }
+
+    @api.model
+    def get_price_listing(self, min_price=None, max_price=None, car_ids=None, on_offer=False,
+                          order='final_price', descending=False, limit=20, offset=0):
+        """Listing of active variants filtered and sorted by their effective price"""
+        order_columns = {'final_price': 'p.final_price', 'savings': 'p.savings', 'base_price': 'p.base_price'}
+        order_by = order_columns.get(order, 'p.final_price')
+        direction = 'DESC' if descending else 'ASC'
+
+        conditions = ['v.active']
+        params = {'limit': limit, 'offset': offset}
+        if min_price is not None:
+            conditions.append('p.final_price >= %(min_price)s')
+            params['min_price'] = min_price
+        if max_price is not None:
+            conditions.append('p.final_price <= %(max_price)s')
+            params['max_price'] = max_price
+        if car_ids:
+            conditions.append('p.car_id = ANY(%(car_ids)s)')
+            params['car_ids'] = list(car_ids)
+        if on_offer:
+            conditions.append('p.offer_id IS NOT NULL')
+
+        self.env.cr.execute(f"""
+            SELECT p.variant_id, p.car_id, p.base_price, p.offer_id, p.final_price, p.savings, p.valid_until
+              FROM alromaih_car_variant_price p
+              JOIN alromaih_car_variant v ON v.id = p.variant_id
+             WHERE {' AND '.join(conditions)}
+          ORDER BY {order_by} {direction}, p.variant_id
+             LIMIT %(limit)s OFFSET %(offset)s
+        """, params)
+
+        return [{
+            'variant_id': variant_id,
+            'car_id': car_id,
+            'base_price': base_price,
+            'offer_id': offer_id,
+            'final_price': final_price,
+            'savings': savings,
+            'valid_until': valid_until.strftime('%Y-%m-%d') if valid_until else None,
+        } for variant_id, car_id, base_price, offer_id, final_price, savings, valid_until in self.env.cr.fetchall()]
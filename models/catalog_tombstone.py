@@ -0,0 +1,132 @@
+from odoo import api, fields, models, tools, _
+from odoo.exceptions import ValidationError
+from datetime import datetime, timedelta
+import base64
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Models exposed by the change feed and the fields returned for created/updated records
+CHANGE_FEED_FIELDS = {
+    'alromaih.car': [
+        'name', 'seo_url_slug', 'brand_id', 'model_id', 'trim_id', 'year_id', 'status', 'active',
+        'cash_price_with_vat', 'has_active_offer', 'is_featured', 'primary_variant_id',
+    ],
+    'alromaih.car.variant': [
+        'name', 'car_id', 'color_id', 'price', 'offer_price', 'has_offer', 'is_primary', 'active',
+    ],
+    'alromaih.car.offer': [
+        'name', 'car_id', 'car_variant_id', 'start_date', 'end_date', 'discount_type',
+        'discount_value', 'final_price', 'is_active', 'offer_tag',
+    ],
+    'alromaih.car.media': [
+        'name', 'car_id', 'car_variant_id', 'media_type', 'content_type', 'external_url',
+        'is_primary', 'is_public', 'active',
+    ],
+    # Effective prices move with offer activation and repricing without touching
+    # the car or variant rows, so the price index is part of the feed
+    'alromaih.car.variant.price': [
+        'variant_id', 'car_id', 'base_price', 'offer_id', 'final_price', 'savings', 'valid_until',
+    ],
+}
+
+
+class CatalogTombstone(models.Model):
+    _name = 'alromaih.catalog.tombstone'
+    _description = _('Catalog Deletion Tombstone')
+    _order = 'create_date, id'
+
+    res_model = fields.Char(string='Model', required=True, readonly=True)
+    res_id = fields.Integer(string='Record ID', required=True, readonly=True)
+
+    def init(self):
+        tools.create_index(self.env.cr, 'alromaih_catalog_tombstone_feed_idx',
+                           self._table, ['create_date', 'id'])
+
+    @api.model
+    def _record_deletion(self, records):
+        """Remember deleted catalog records so change feed clients can drop them"""
+        if records:
+            self.sudo().create([{'res_model': records._name, 'res_id': record_id} for record_id in records.ids])
+
+    @api.autovacuum
+    def _gc_tombstones(self):
+        """Drop tombstones older than the retention period"""
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'alromaih_cars_dash.tombstone_retention_days', 90))
+        limit_date = fields.Datetime.now() - timedelta(days=days)
+        self.env.cr.execute("DELETE FROM alromaih_catalog_tombstone WHERE create_date < %s", [limit_date])
+        _logger.info("Catalog tombstones: removed %d entries older than %d days", self.env.cr.rowcount, days)
+
+    @api.model
+    def _decode_cursor(self, cursor):
+        """Opaque cursor -> {key: (datetime, id)}; ValidationError when it is malformed"""
+        if not cursor:
+            return {}
+        try:
+            positions = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            if not isinstance(positions, dict):
+                raise ValueError(cursor)
+            return {key: (datetime.fromisoformat(stamp), int(record_id)) for key, (stamp, record_id) in positions.items()}
+        except (ValueError, TypeError):
+            raise ValidationError(_('Invalid change feed cursor.'))
+
+    @api.model
+    def _encode_cursor(self, positions):
+        data = {key: [stamp.isoformat(), record_id] for key, (stamp, record_id) in positions.items()}
+        return base64.urlsafe_b64encode(json.dumps(data, sort_keys=True).encode()).decode()
+
+    @api.model
+    def _keyset_domain(self, date_field, position):
+        if not position:
+            return []
+        stamp, record_id = position
+        return ['|', (date_field, '>', stamp), '&', (date_field, '=', stamp), ('id', '>', record_id)]
+
+    @api.model
+    def get_changes(self, cursor=None, limit=500):
+        """Created, updated and deleted catalog records since the opaque cursor.
+
+        Each model is walked on a (write_date, id) keyset, tombstones on
+        (create_date, id). Returns {'changes': {model: {'created', 'updated',
+        'deleted'}}, 'cursor': next cursor, 'has_more': bool}.
+        """
+        positions = self._decode_cursor(cursor)
+        changes = {}
+        has_more = False
+
+        for model_name, field_names in CHANGE_FEED_FIELDS.items():
+            Model = self.env[model_name].with_context(active_test=False)
+            position = positions.get(model_name)
+            records = Model.search(self._keyset_domain('write_date', position),
+                                   order='write_date, id', limit=limit + 1)
+            if len(records) > limit:
+                has_more = True
+                records = records[:limit]
+
+            created, updated = [], []
+            for row in records.read(field_names + ['create_date', 'write_date']):
+                (created if position is None or row['create_date'] > position[0] else updated).append(row)
+            changes[model_name] = {'created': created, 'updated': updated, 'deleted': []}
+            if records:
+                last = records[-1]
+                positions[model_name] = (last.write_date, last.id)
+
+        tombstone_position = positions.get('deleted')
+        tombstones = self.sudo().search(self._keyset_domain('create_date', tombstone_position),
+                                        order='create_date, id', limit=limit + 1)
+        if len(tombstones) > limit:
+            has_more = True
+            tombstones = tombstones[:limit]
+        for tombstone in tombstones:
+            if tombstone.res_model in changes:
+                changes[tombstone.res_model]['deleted'].append(tombstone.res_id)
+        if tombstones:
+            positions['deleted'] = (tombstones[-1].create_date, tombstones[-1].id)
+
+        return {
+            'changes': changes,
+            'cursor': self._encode_cursor(positions),
+            'has_more': has_more,
+        }
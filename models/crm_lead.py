@@ -0,0 +1,11 @@
+from odoo import api, models
+
+
+class CrmLead(models.Model):
+    _inherit = 'crm.lead'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        leads = super().create(vals_list)
+        self.env['alromaih.dashboard.bus']._publish('lead_created', leads.ids)
+        return leads
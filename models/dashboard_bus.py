@@ -0,0 +1,46 @@
+from odoo import api, models, _
+import logging
+
+_logger = logging.getLogger(__name__)
+
+DASHBOARD_CHANNEL = 'alromaih_dashboard'
+DASHBOARD_NOTIFICATION = 'alromaih_dashboard/update'
+PENDING_KEY = 'alromaih.dashboard.pending'
+# Number of record ids kept per event type in one coalesced notification
+MAX_EVENT_IDS = 20
+
+
+class DashboardBus(models.AbstractModel):
+    _name = 'alromaih.dashboard.bus'
+    _description = _('Dashboard Live Updates Publisher')
+
+    @api.model
+    def _publish(self, event, record_ids):
+        """Queue a dashboard delta event; all events of a transaction are sent as one bus message"""
+        if not record_ids:
+            return
+        data = self.env.cr.precommit.data
+        if PENDING_KEY not in data:
+            data[PENDING_KEY] = {}
+            self.env.cr.precommit.add(self._flush_pending)
+        pending = data[PENDING_KEY].setdefault(event, {'count': 0, 'ids': []})
+        pending['count'] += len(record_ids)
+        pending['ids'] = (pending['ids'] + list(record_ids))[-MAX_EVENT_IDS:]
+
+    @api.model
+    def _flush_pending(self):
+        events = self.env.cr.precommit.data.pop(PENDING_KEY, {})
+        if events:
+            self.env['bus.bus']._sendone(DASHBOARD_CHANNEL, DASHBOARD_NOTIFICATION, {'events': events})
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        # Internal users may subscribe to the live dashboard channel
+        if DASHBOARD_CHANNEL in channels:
+            channels = [channel for channel in channels if channel != DASHBOARD_CHANNEL]
+            if self.env.user._is_internal():
+                channels.append(DASHBOARD_CHANNEL)
+        return super()._build_bus_channel_list(channels)
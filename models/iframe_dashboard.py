@@ -1,5 +1,6 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
+from .dashboard_bus import DASHBOARD_CHANNEL, DASHBOARD_NOTIFICATION
 
 
 class IframeDashboard(models.Model):
@@ -87,6 +88,8 @@ class IframeDashboard(models.Model):
             'allowed_origins': dashboard.iframe_allowed_origins or '',
             'environment': dashboard.environment,
             'sandbox_attrs': 'allow-same-origin allow-scripts allow-popups allow-forms allow-top-navigation allow-downloads',
+            'bus_channel': DASHBOARD_CHANNEL,
+            'bus_notification_type': DASHBOARD_NOTIFICATION,
         }
         
         # Add API key to URL if available
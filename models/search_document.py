@@ -0,0 +1,230 @@
+from odoo import api, fields, models, tools, _
+from odoo.tools import html2plaintext
+import logging
+
+_logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'alromaih.search.pending'
+
+
+class SearchIndexedMixin(models.AbstractModel):
+    """Keeps alromaih.search.document rows in sync for the inheriting model.
+
+    Inheriting models declare which fields feed the index; reindexing is
+    coalesced per transaction and runs once just before commit.
+    """
+    _name = 'alromaih.search.mixin'
+    _description = _('Full-Text Search Indexed Mixin')
+
+    _search_title_field = 'name'
+    _search_body_fields = []
+    _search_slug_field = None
+
+    def _get_search_index_fields(self):
+        fields_list = [self._search_title_field] + list(self._search_body_fields)
+        if self._search_slug_field:
+            fields_list.append(self._search_slug_field)
+        return fields_list
+
+    def _is_search_public(self):
+        """Return the ids of self that anonymous visitors may find"""
+        return set()
+
+    def _schedule_search_index(self):
+        data = self.env.cr.precommit.data
+        if PENDING_KEY not in data:
+            data[PENDING_KEY] = {}
+            self.env.cr.precommit.add(self.env['alromaih.search.document']._process_pending)
+        data[PENDING_KEY].setdefault(self._name, set()).update(self.ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._schedule_search_index()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if any(field in vals for field in self._get_search_index_fields() + self._get_search_visibility_fields()):
+            self._schedule_search_index()
+        return result
+
+    def unlink(self):
+        self.env['alromaih.search.document']._remove_documents(self._name, self.ids)
+        return super().unlink()
+
+    def _get_search_visibility_fields(self):
+        return ['active']
+
+
+class SearchDocument(models.Model):
+    _name = 'alromaih.search.document'
+    _description = _('Full-Text Search Document')
+    _log_access = False
+
+    res_model = fields.Char(string='Model', required=True, readonly=True)
+    res_id = fields.Integer(string='Record ID', required=True, readonly=True)
+    lang = fields.Char(string='Language', required=True, readonly=True)
+    ts_config = fields.Char(string='Text Search Configuration', required=True, readonly=True)
+    title = fields.Char(string='Title', readonly=True)
+    body = fields.Text(string='Body', readonly=True)
+    slug = fields.Char(string='Slug', readonly=True)
+    is_public = fields.Boolean(string='Public', readonly=True)
+
+    _sql_constraints = [
+        ('document_uniq', 'unique(res_model, res_id, lang)', 'A record is indexed once per language.'),
+    ]
+
+    def init(self):
+        # The tsvector column is maintained in SQL only and is unknown to the ORM
+        self.env.cr.execute("ALTER TABLE alromaih_search_document ADD COLUMN IF NOT EXISTS tsv tsvector")
+        tools.create_index(self.env.cr, 'alromaih_search_document_tsv_idx',
+                           self._table, ['tsv'], method='gin')
+        tools.create_index(self.env.cr, 'alromaih_search_document_lang_model_idx',
+                           self._table, ['lang', 'res_model', 'is_public'])
+
+    @api.model
+    def _get_index_languages(self):
+        """{lang code: text search configuration} for installed Arabic and English languages"""
+        self.env.cr.execute("SELECT 1 FROM pg_ts_config WHERE cfgname = 'arabic'")
+        arabic_config = 'arabic' if self.env.cr.fetchone() else 'simple'
+        languages = {}
+        for code, _name in self.env['res.lang'].get_installed():
+            if code.startswith('ar'):
+                languages[code] = arabic_config
+            elif code.startswith('en'):
+                languages[code] = 'english'
+        return languages
+
+    @api.model
+    def _process_pending(self):
+        """Precommit hook: reindex every record touched in the transaction"""
+        pending = self.env.cr.precommit.data.pop(PENDING_KEY, {})
+        for model_name, ids in pending.items():
+            records = self.env[model_name].sudo().with_context(active_test=False).browse(ids).exists()
+            self._index_records(records)
+
+    @api.model
+    def _remove_documents(self, model_name, ids):
+        if ids:
+            self.env.cr.execute("DELETE FROM alromaih_search_document WHERE res_model = %s AND res_id = ANY(%s)",
+                                [model_name, list(ids)])
+
+    @api.model
+    def _index_records(self, records):
+        """Rebuild the documents of records in every indexed language"""
+        if not records:
+            return
+        self._remove_documents(records._name, records.ids)
+        public_ids = records._is_search_public()
+        active_ids = set(records.filtered(lambda r: r.active).ids) if 'active' in records._fields else set(records.ids)
+        title_field = records._search_title_field
+        body_fields = records._search_body_fields
+        slug_field = records._search_slug_field
+
+        rows = []
+        for lang, ts_config in self._get_index_languages().items():
+            for values in records.with_context(lang=lang).read(records._get_search_index_fields()):
+                if values['id'] not in active_ids:
+                    continue
+                body = '\n'.join(
+                    html2plaintext(values[name]) if records._fields[name].type == 'html' else values[name]
+                    for name in body_fields if values.get(name)
+                )
+                rows.append({
+                    'res_model': records._name,
+                    'res_id': values['id'],
+                    'lang': lang,
+                    'ts_config': ts_config,
+                    'title': values[title_field] or '',
+                    'body': body,
+                    'slug': values[slug_field] if slug_field else None,
+                    'is_public': values['id'] in public_ids,
+                })
+
+        if rows:
+            self.env.cr.executemany("""
+                INSERT INTO alromaih_search_document
+                       (res_model, res_id, lang, ts_config, title, body, slug, is_public, tsv)
+                VALUES (%(res_model)s, %(res_id)s, %(lang)s, %(ts_config)s, %(title)s, %(body)s, %(slug)s,
+                        %(is_public)s,
+                        setweight(to_tsvector(%(ts_config)s::regconfig, %(title)s), 'A')
+                        || setweight(to_tsvector(%(ts_config)s::regconfig, %(body)s), 'B'))
+            """, rows)
+        self.invalidate_model()
+
+    @api.model
+    def action_rebuild_search_index(self, batch_size=500):
+        """Reindex every car, variant, news article and blog post"""
+        total = 0
+        for model_name in ('alromaih.car', 'alromaih.car.variant', 'alromaih.news', 'alromaih.blog'):
+            Model = self.env[model_name].sudo().with_context(active_test=False)
+            ids = Model.search([], order='id').ids
+            for start in range(0, len(ids), batch_size):
+                self._index_records(Model.browse(ids[start:start + batch_size]))
+                self.env.invalidate_all()
+            total += len(ids)
+            _logger.info("Search index: indexed %d %s records", len(ids), model_name)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Search Index Rebuilt'),
+                'message': _('Indexed %d records.') % total,
+                'type': 'success',
+            }
+        }
+
+    @api.model
+    def search_documents(self, query, lang=None, model_names=None, public_only=True, limit=20, offset=0):
+        """Ranked full-text search with highlighted snippets.
+
+        Snippets are HTML: the body is escaped and matches are wrapped in <mark>.
+        """
+        if not query or not query.strip():
+            return {'total': 0, 'results': []}
+        languages = self._get_index_languages()
+        lang = lang if lang in languages else (self.env.lang if self.env.lang in languages else next(iter(languages), None))
+        if not lang:
+            return {'total': 0, 'results': []}
+
+        conditions = ['d.lang = %(lang)s', 'd.tsv @@ q.query']
+        params = {'lang': lang, 'ts_config': languages[lang], 'query': query, 'limit': limit, 'offset': offset}
+        if public_only:
+            conditions.append('d.is_public')
+        if model_names:
+            conditions.append('d.res_model = ANY(%(models)s)')
+            params['models'] = list(model_names)
+
+        self.env.cr.execute(f"""
+            WITH q AS (SELECT websearch_to_tsquery(%(ts_config)s::regconfig, %(query)s) AS query),
+            matches AS (
+                SELECT d.id, ts_rank(d.tsv, q.query) AS rank, COUNT(*) OVER () AS total
+                  FROM alromaih_search_document d, q
+                 WHERE {' AND '.join(conditions)}
+              ORDER BY rank DESC, d.id
+                 LIMIT %(limit)s OFFSET %(offset)s
+            )
+            SELECT d.res_model, d.res_id, d.title, d.slug, m.rank, m.total,
+                   ts_headline(d.ts_config::regconfig,
+                               replace(replace(replace(replace(COALESCE(d.body, ''),
+                                   '&', '&amp;'), '<', '&lt;'), '>', '&gt;'), '"', '&quot;'),
+                               q.query,
+                               'MaxFragments=2, MinWords=8, MaxWords=25, StartSel=<mark>, StopSel=</mark>')
+              FROM matches m
+              JOIN alromaih_search_document d ON d.id = m.id, q
+          ORDER BY m.rank DESC, d.id
+        """, params)
+
+        rows = self.env.cr.fetchall()
+        return {
+            'total': rows[0][5] if rows else 0,
+            'results': [{
+                'model': res_model,
+                'id': res_id,
+                'title': title,
+                'slug': slug,
+                'rank': rank,
+                'snippet': snippet,
+            } for res_model, res_id, title, slug, rank, _total, snippet in rows],
+        }
@@ -0,0 +1,123 @@
+from odoo import api, fields, models, _
+from xml.sax.saxutils import escape
+import hashlib
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Sitemap protocol limit of URLs per file
+SITEMAP_CHUNK_SIZE = 50000
+
+# source key -> (model, slug field, domain, frontend path pattern)
+SITEMAP_SOURCES = {
+    'cars': ('alromaih.car', 'seo_url_slug', [('status', '=', 'published')], '/cars/%s'),
+    'news': ('alromaih.news', 'slug', [('is_published', '=', True)], '/news/%s'),
+    'blog': ('alromaih.blog', 'slug', [('is_published', '=', True)], '/blog/%s'),
+    'blog-categories': ('alromaih.blog.category', 'slug', [], '/blog/category/%s'),
+}
+
+
+class AlromaihSitemap(models.AbstractModel):
+    _name = 'alromaih.sitemap'
+    _description = _('Alromaih Sitemap Generator')
+
+    @api.model
+    def _get_base_url(self):
+        params = self.env['ir.config_parameter'].sudo()
+        return (params.get_param('alromaih_cars_dash.frontend_base_url')
+                or params.get_param('web.base.url', '')).rstrip('/')
+
+    @api.model
+    def _get_source_domain(self, source):
+        model_name, slug_field, domain, _path = SITEMAP_SOURCES[source]
+        return domain + [(slug_field, '!=', False)]
+
+    @api.model
+    def _get_chunk_records(self, source, index):
+        model_name = SITEMAP_SOURCES[source][0]
+        return self.env[model_name].sudo().search(
+            self._get_source_domain(source), order='id',
+            offset=index * SITEMAP_CHUNK_SIZE, limit=SITEMAP_CHUNK_SIZE,
+        )
+
+    @api.model
+    def _get_chunk_fingerprint(self, records):
+        """Changes whenever a record of the chunk is added, removed or modified"""
+        if not records:
+            return 'empty'
+        [(max_write_date,)] = records._read_group([('id', 'in', records.ids)], [], ['write_date:max'])
+        digest = hashlib.sha1(','.join(map(str, records.ids)).encode()).hexdigest()
+        return f'{len(records)}:{max_write_date}:{digest}'
+
+    @api.model
+    def get_sitemap_index(self):
+        """Sitemap index listing every chunk of every source"""
+        base_url = self._get_base_url()
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+        ]
+        for source, (model_name, _slug, _domain, _path) in SITEMAP_SOURCES.items():
+            Model = self.env[model_name].sudo()
+            domain = self._get_source_domain(source)
+            count = Model.search_count(domain)
+            if not count:
+                continue
+            [(lastmod,)] = Model._read_group(domain, [], ['write_date:max'])
+            for index in range((count - 1) // SITEMAP_CHUNK_SIZE + 1):
+                lines.append('  <sitemap>')
+                lines.append(f'    <loc>{escape(base_url)}/alromaih/sitemap-{source}-{index}.xml</loc>')
+                if lastmod:
+                    lines.append(f'    <lastmod>{lastmod.strftime("%Y-%m-%dT%H:%M:%S+00:00")}</lastmod>')
+                lines.append('  </sitemap>')
+        lines.append('</sitemapindex>')
+        return '\n'.join(lines).encode()
+
+    @api.model
+    def get_sitemap_chunk(self, source, index):
+        """XML of one sitemap chunk, served from its cached attachment while unchanged"""
+        if source not in SITEMAP_SOURCES or index < 0:
+            return None
+        records = self._get_chunk_records(source, index)
+        if not records:
+            return None
+
+        fingerprint = self._get_chunk_fingerprint(records)
+        name = f'alromaih_sitemap_{source}_{index}.xml'
+        Attachment = self.env['ir.attachment'].sudo()
+        attachment = Attachment.search([
+            ('res_model', '=', self._name), ('name', '=', name),
+        ], limit=1)
+        if attachment and attachment.description == fingerprint:
+            return attachment.raw
+
+        content = self._render_chunk(source, records)
+        values = {'raw': content, 'description': fingerprint, 'mimetype': 'application/xml'}
+        if attachment:
+            attachment.write(values)
+        else:
+            Attachment.create(dict(values, name=name, res_model=self._name, public=False))
+        _logger.info("Sitemap chunk %s regenerated with %d URLs", name, len(records))
+        return content
+
+    @api.model
+    def _render_chunk(self, source, records):
+        model_name, slug_field, _domain, path = SITEMAP_SOURCES[source]
+        base_url = self._get_base_url()
+        read_fields = [slug_field, 'write_date']
+        has_canonical = 'seo_canonical_url' in records._fields
+        if has_canonical:
+            read_fields.append('seo_canonical_url')
+
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+        ]
+        for row in records.read(read_fields):
+            loc = (has_canonical and row['seo_canonical_url']) or base_url + path % row[slug_field]
+            lines.append('  <url>')
+            lines.append(f'    <loc>{escape(loc)}</loc>')
+            lines.append(f'    <lastmod>{row["write_date"].strftime("%Y-%m-%dT%H:%M:%S+00:00")}</lastmod>')
+            lines.append('  </url>')
+        lines.append('</urlset>')
+        return '\n'.join(lines).encode()
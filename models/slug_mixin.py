@@ -0,0 +1,112 @@
+from odoo import api, models, tools, _
+import itertools
+import re
+import logging
+
+_logger = logging.getLogger(__name__)
+
+SLUG_SUFFIX_RE = re.compile(r'^[0-9]+$')
+
+
+class SlugAllocatorMixin(models.AbstractModel):
+    """Allocates unique URL slugs for the inheriting model.
+
+    The slugs already derived from a base are fetched with one prefix query
+    (``slug = base OR slug LIKE 'base-%'``) served by a text_pattern_ops index,
+    and the smallest free numeric suffix is picked in Python instead of probing
+    base-1, base-2, ... one search at a time.
+    """
+    _name = 'alromaih.slug.mixin'
+    _description = _('Unique Slug Allocator Mixin')
+
+    _slug_field = 'slug'
+
+    def init(self):
+        super().init()
+        if self._abstract or not tools.column_exists(self.env.cr, self._table, self._slug_field):
+            return
+        tools.create_index(self.env.cr, f'{self._table}_{self._slug_field}_pattern_idx',
+                           self._table, [f'{self._slug_field} text_pattern_ops'])
+
+    @api.model
+    def _slugify(self, text):
+        """URL-friendly base slug for text"""
+        if not text:
+            return ''
+        slug = re.sub(r'[^\w\s-]', '', text.lower())
+        return re.sub(r'[-\s]+', '-', slug).strip('-')
+
+    @api.model
+    def _get_used_slug_suffixes(self, bases, exclude_ids=()):
+        """{base: set of suffixes in use} where 0 stands for the bare base, in one query.
+
+        Numeric endings only mark their own slot as taken: a slug such as
+        ``toyota-camry-2024`` occupies suffix 2024 of ``toyota-camry`` but does
+        not push the next allocation past it.
+        """
+        used = {base: set() for base in bases}
+        if not used:
+            return used
+        field = self._slug_field
+        self.flush_model([field])
+
+        conditions, params = [], []
+        for base in used:
+            pattern = base.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append(f'"{field}" = %s OR "{field}" LIKE %s')
+            params.extend([base, f'{pattern}-%'])
+        query = f'SELECT "{field}" FROM "{self._table}" WHERE ({" OR ".join(conditions)})'
+        if exclude_ids:
+            query += ' AND id != ALL(%s)'
+            params.append(list(exclude_ids))
+        self.env.cr.execute(query, params)
+
+        for (slug,) in self.env.cr.fetchall():
+            if slug in used:
+                used[slug].add(0)
+            base, _sep, suffix = slug.rpartition('-')
+            if base in used and SLUG_SUFFIX_RE.match(suffix):
+                used[base].add(int(suffix))
+        return used
+
+    @api.model
+    def _allocate_slugs(self, bases, exclude_ids=()):
+        """Unique slugs for a list of base slugs, in order.
+
+        The bare base is used when free, otherwise the smallest free suffix
+        starting at 1, as the sequential probing did. Every distinct base is
+        looked up in the same query and repeated bases within the batch get
+        the following free suffixes.
+        """
+        used = self._get_used_slug_suffixes({base for base in bases if base}, exclude_ids)
+        slugs = []
+        for base in bases:
+            if not base:
+                slugs.append(base)
+                continue
+            suffixes = used[base]
+            suffix = next(n for n in itertools.count() if n not in suffixes)
+            suffixes.add(suffix)
+            slugs.append(f'{base}-{suffix}' if suffix else base)
+        return slugs
+
+    def _generate_slug(self, text):
+        """Unique URL-friendly slug for text, ignoring the current slugs of self"""
+        return self._allocate_slugs([self._slugify(text)], exclude_ids=self.ids)[0]
+
+    def _write_with_unique_slugs(self, vals, source_field):
+        """Multi-record rename: allocate one slug per record and write each record on its own"""
+        slugs = self._allocate_slugs([self._slugify(vals[source_field])] * len(self), exclude_ids=self.ids)
+        for record, slug in zip(self, slugs):
+            record.write(dict(vals, **{self._slug_field: slug}))
+        return True
+
+    @api.model
+    def _fill_missing_slugs(self, vals_list, source_field):
+        """Give every vals dict without a slug one allocated from source_field, in one batch"""
+        pending = [vals for vals in vals_list if not vals.get(self._slug_field) and vals.get(source_field)]
+        if not pending:
+            return
+        slugs = self._allocate_slugs([self._slugify(vals[source_field]) for vals in pending])
+        for vals, slug in zip(pending, slugs):
+            vals[self._slug_field] = slug
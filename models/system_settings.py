@@ -1,13 +1,61 @@
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.api import Environment
 from odoo.exceptions import ValidationError
 import logging
 import requests
 import base64
+import hashlib
+import io
+import json
 import re
+from PIL import Image, ImageColor, ImageOps
 
 _logger = logging.getLogger(__name__)
 
+# Settings exposed to anonymous storefront clients (API keys and secrets stay private)
+PUBLIC_SETTINGS_FIELDS = [
+    'website_name', 'company_phone', 'company_email', 'company_address', 'whatsapp_business_number',
+    'customer_support_email', 'business_registration_number', 'vat_number', 'copyright_text',
+    'business_hours_open', 'business_hours_close', 'business_days',
+    'facebook_url', 'instagram_url', 'youtube_url', 'snapchat_url', 'tiktok_url', 'linkedin_url', 'x_url',
+    'meta_title', 'meta_description', 'meta_keywords',
+    'google_analytics_id', 'google_tag_manager_id', 'tiktok_pixel_id', 'meta_pixel_id',
+    'snapchat_pixel_id', 'linkedin_pixel_id', 'x_pixel_id',
+    'primary_color', 'secondary_color', 'app_name', 'app_store_url', 'play_store_url',
+    'android_app_version', 'android_min_version', 'ios_app_version', 'ios_min_version', 'force_update',
+    'enable_app_notifications', 'enable_in_app_chat', 'enable_car_comparison', 'enable_app_booking',
+    'enable_app_reviews', 'cars_per_page', 'featured_cars_limit', 'maintenance_mode',
+]
+
+# Fields read when building the cached public settings document; writes touching
+# none of them keep the cache
+PUBLIC_DOCUMENT_FIELDS = set(PUBLIC_SETTINGS_FIELDS) | {
+    'active', 'cache_duration', 'icon_master_image', 'icon_derivative_paths',
+    'logo_arabic', 'logo_english', 'website_favicon', 'app_logo', 'app_splash_screen',
+    'logo_arabic_bunny_path', 'logo_english_bunny_path', 'website_favicon_bunny_path',
+    'app_logo_bunny_path', 'app_splash_screen_bunny_path',
+}
+
+# Settings never mirrored to ir.config_parameter
+PARAM_SKIP_FIELDS = {'id', 'active', 'create_uid', 'create_date', 'write_uid', 'write_date', '__last_update',
+                     'icon_derivative_paths'}
+PARAM_SKIP_TYPES = {'binary', 'many2one', 'one2many', 'many2many'}
+
+# Icons rendered from icon_master_image: name -> (pixel size, file type)
+ICON_DERIVATIVES = {
+    'favicon-16': (16, 'png'),
+    'favicon-32': (32, 'png'),
+    'favicon-ico': (48, 'ico'),
+    'apple-touch-icon': (180, 'png'),
+    'icon-192': (192, 'png'),
+    'icon-512': (512, 'png'),
+    'icon-maskable-512': (512, 'png'),
+}
+ICO_SIZES = [(16, 16), (32, 32), (48, 48)]
+# Maskable icons keep their content inside the central 80% safe zone
+MASKABLE_SAFE_ZONE = 0.8
+SPLASH_MAX_SIZE = (1242, 2688)
+
 
 class AlromaihSystemSettings(models.Model):
     _name = 'alromaih.system.settings'
@@ -129,6 +177,15 @@ class AlromaihSystemSettings(models.Model):
     app_splash_screen_bunny_path = fields.Char(string='App Splash Screen Bunny Path',
                                               help="Path to app splash screen in Bunny Storage")
     
+    # Favicon and app icon derivatives
+    icon_master_image = fields.Binary(string='Icon Master Image',
+                                      help='Square PNG, JPEG or WebP image of at least 512x512px. '
+                                           'Favicons (16, 32, ICO), the Apple touch icon and the '
+                                           'app icons (192, 512, maskable) are generated from it.')
+    icon_derivative_paths = fields.Text(string='Icon Derivative Paths', readonly=True,
+                                        help="JSON map of generated icons and the optimized splash screen "
+                                             "to their paths in Bunny Storage")
+    
     # CDN URL fields (computed)
     logo_arabic_cdn_url = fields.Char(string='Logo Arabic CDN URL', compute='_compute_cdn_urls',
                                               help="Fast CDN URL for Arabic logo")
@@ -276,6 +333,10 @@ class AlromaihSystemSettings(models.Model):
         
         # Upload binary fields to Bunny Storage
         res._upload_all_to_bunny()
+        res._generate_icon_derivatives()
+        
+        # Drop the cached public settings document: the active record itself changed
+        self.env.registry.clear_cache()
         
         return res
         
@@ -315,33 +376,70 @@ class AlromaihSystemSettings(models.Model):
                     if binary_value:
                         record._upload_binary_field_to_bunny(field_name)
         
+        # Regenerate icon and splash derivatives whose source image changed
+        sources = [source for source, field_name in (('icon', 'icon_master_image'), ('splash', 'app_splash_screen'))
+                   if field_name in vals]
+        if sources:
+            for record in self:
+                record._generate_icon_derivatives(sources)
+        
+        # Drop the cached public settings document if any of its inputs changed
+        if PUBLIC_DOCUMENT_FIELDS.intersection(vals):
+            self.env.registry.clear_cache()
+        
         return result
     
+    def _get_param_fields(self):
+        """Stored scalar settings mirrored to ir.config_parameter.
+        
+        Binaries live in attachments and on the CDN, computed fields are derived;
+        neither belongs in the parameter table that every worker caches in memory.
+        """
+        return [
+            field_name for field_name, field in self._fields.items()
+            if field.store and not field.compute and field.type not in PARAM_SKIP_TYPES
+            and field_name not in PARAM_SKIP_FIELDS
+        ]
+    
     def _save_params(self, record, param_names=None):
-        """Save settings to ir.config_parameter"""
-        for field_name, field in record._fields.items():
-            # Skip non-config fields
-            if field_name in ['id', 'active', 'create_uid', 'create_date', 
-                              'write_uid', 'write_date', '__last_update']:
-                continue
-                
-            # If param_names is provided, only save those params
-            if param_names and field_name not in param_names:
-                continue
-                
-            # Get value and save it
-            value = record[field_name]
-            if value is not None:
-                record.set_param(field_name, value)
+        """Save changed settings to ir.config_parameter in one batch"""
+        field_names = [
+            field_name for field_name in self._get_param_fields()
+            if not param_names or field_name in param_names
+        ]
+        if not field_names:
+            return
+        values = {f'alromaih_cars_dash.{field_name}': record[field_name] for field_name in field_names}
+        
+        Param = self.env['ir.config_parameter'].sudo()
+        existing = {param.key: param for param in Param.search([('key', 'in', list(values))])}
+        to_create = []
+        to_unlink = Param
+        to_write = {}
+        for key, value in values.items():
+            param = existing.get(key)
+            # Same semantics as ir.config_parameter.set_param: False/None removes the parameter
+            if value is False or value is None:
+                if param:
+                    to_unlink |= param
+            elif not param:
+                to_create.append({'key': key, 'value': str(value)})
+            elif param.value != str(value):
+                to_write.setdefault(str(value), Param)
+                to_write[str(value)] |= param
+        
+        if to_unlink:
+            to_unlink.unlink()
+        for value, params in to_write.items():
+            params.write({'value': value})
+        if to_create:
+            Param.create(to_create)
     
     @api.model
     def load_from_params(self, record):
         """Load settings from ir.config_parameter"""
-        for field_name, field in record._fields.items():
-            # Skip non-config fields
-            if field_name in ['id', 'active', 'create_uid', 'create_date', 
-                              'write_uid', 'write_date', '__last_update']:
-                continue
+        for field_name in self._get_param_fields():
+            field = record._fields[field_name]
             
             # Get value from parameters
             param_value = record.get_param(field_name)
@@ -493,7 +591,7 @@ class AlromaihSystemSettings(models.Model):
                 return 'ico'  # Conservative choice for favicon
             return 'png'  # Safe default for other images
 
-    def _generate_seo_file_name(self, field_name, file_type=None):
+    def _generate_seo_file_name(self, field_name, file_type=None, variant=None):
         """Generate SEO-optimized file name for system settings files"""
         from datetime import datetime
         import uuid
@@ -514,6 +612,11 @@ class AlromaihSystemSettings(models.Model):
             name_parts.extend(['mobile', 'app', 'logo'])
         elif field_name == 'app_splash_screen':
             name_parts.extend(['mobile', 'app', 'splash', 'screen'])
+        elif field_name == 'icon_master_image':
+            name_parts.extend(['icon'])
+        
+        if variant:
+            name_parts.append(variant)
         
         # Auto-detect file type if not provided
         if file_type is None:
@@ -670,6 +773,142 @@ class AlromaihSystemSettings(models.Model):
         for field_name in binary_fields:
             self._upload_binary_field_to_bunny(field_name)
 
+    # === ICON DERIVATIVES ===
+    
+    def _open_image(self, binary_value, field_name):
+        """Decode a base64 raster image, applying its EXIF orientation; None when Pillow can't read it"""
+        try:
+            image = Image.open(io.BytesIO(base64.b64decode(binary_value)))
+            image.load()
+        except (OSError, ValueError) as e:
+            _logger.warning(f"Skipping derivatives of {field_name}, the image cannot be decoded: {e}")
+            return None
+        return ImageOps.exif_transpose(image)
+    
+    def _encode_image(self, image, file_type, **params):
+        output = io.BytesIO()
+        image.save(output, format=file_type.upper(), **params)
+        return output.getvalue()
+    
+    def _render_icon_derivatives(self):
+        """{name: (bytes, file type)} for every size in ICON_DERIVATIVES"""
+        self.ensure_one()
+        master = self._open_image(self.icon_master_image, 'icon_master_image')
+        if master is None:
+            return {}
+        master = master.convert('RGBA')
+        # Center-crop to a square so no icon is distorted
+        side = min(master.size)
+        master = ImageOps.fit(master, (side, side), Image.LANCZOS)
+        if side < 512:
+            _logger.warning("Icon master image is %dpx, icons above that size will be upscaled", side)
+        
+        try:
+            background_color = ImageColor.getrgb(self.primary_color or '#FFFFFF')
+        except ValueError:
+            background_color = (255, 255, 255)
+        
+        rendered = {}
+        for name, (size, file_type) in ICON_DERIVATIVES.items():
+            if file_type == 'ico':
+                rendered[name] = (self._encode_image(master, 'ico', sizes=ICO_SIZES), file_type)
+                continue
+            if name == 'icon-maskable-512':
+                inner = int(size * MASKABLE_SAFE_ZONE)
+                image = Image.new('RGBA', (size, size), background_color)
+                image.alpha_composite(master.resize((inner, inner), Image.LANCZOS),
+                                      ((size - inner) // 2, (size - inner) // 2))
+            elif name == 'apple-touch-icon':
+                # iOS renders transparent pixels black
+                image = Image.new('RGBA', (size, size), (255, 255, 255))
+                image.alpha_composite(master.resize((size, size), Image.LANCZOS))
+                image = image.convert('RGB')
+            else:
+                image = master.resize((size, size), Image.LANCZOS)
+            rendered[name] = (self._encode_image(image, 'png', optimize=True), file_type)
+        return rendered
+    
+    def _render_splash_derivative(self):
+        """Splash screen downscaled to SPLASH_MAX_SIZE: JPEG, or PNG when it has transparency"""
+        self.ensure_one()
+        image = self._open_image(self.app_splash_screen, 'app_splash_screen')
+        if image is None:
+            return {}
+        image.thumbnail(SPLASH_MAX_SIZE, Image.LANCZOS)
+        if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+            return {'splash': (self._encode_image(image.convert('RGBA'), 'png', optimize=True), 'png')}
+        return {'splash': (self._encode_image(image.convert('RGB'), 'jpeg', quality=85, optimize=True,
+                                              progressive=True), 'jpg')}
+    
+    def _get_icon_derivative_paths(self):
+        self.ensure_one()
+        try:
+            return json.loads(self.icon_derivative_paths or '{}')
+        except ValueError:
+            return {}
+    
+    def _get_icon_derivative_urls(self):
+        """{name: CDN URL} of the generated icons and splash screen"""
+        self.ensure_one()
+        paths = self._get_icon_derivative_paths()
+        if not paths:
+            return {}
+        cdn_domain = self._get_bunny_config()['cdn_domain']
+        return {name: f"https://{cdn_domain}/{path}" for name, path in paths.items()}
+    
+    def _generate_icon_derivatives(self, sources=('icon', 'splash')):
+        """Render the derivatives of the given sources, upload them once to Bunny Storage
+        and record their paths; derivatives of a removed source image are deleted.
+        
+        Returns the number of uploaded files.
+        """
+        self.ensure_one()
+        source_config = {
+            'icon': (self.icon_master_image, self._render_icon_derivatives, list(ICON_DERIVATIVES)),
+            'splash': (self.app_splash_screen, self._render_splash_derivative, ['splash']),
+        }
+        paths = self._get_icon_derivative_paths()
+        rendered = {}
+        obsolete = []
+        for source in sources:
+            binary_value, render, names = source_config[source]
+            if binary_value:
+                rendered.update(render())
+            else:
+                obsolete.extend(name for name in names if name in paths)
+        
+        uploaded = {}
+        for name, (content, file_type) in rendered.items():
+            field_name, variant = ('app_splash_screen', 'optimized') if name == 'splash' else ('icon_master_image', name)
+            file_name = self._generate_seo_file_name(field_name, file_type, variant=variant)
+            bunny_path = self._upload_to_bunny_storage(base64.b64encode(content), file_name)
+            if bunny_path:
+                uploaded[name] = bunny_path
+        
+        for name in obsolete + [name for name in uploaded if name in paths]:
+            self._delete_from_bunny_storage(paths.pop(name))
+        paths.update(uploaded)
+        
+        if uploaded or obsolete:
+            self.icon_derivative_paths = json.dumps(paths, sort_keys=True) if paths else False
+        return len(uploaded)
+    
+    def action_generate_icon_derivatives(self):
+        """Manual action to regenerate favicons, app icons and the optimized splash screen"""
+        self.ensure_one()
+        if not self.icon_master_image and not self.app_splash_screen:
+            raise ValidationError(_('Upload an icon master image or a splash screen first.'))
+        uploaded_count = self._generate_icon_derivatives()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Icons Generated'),
+                'message': _('Uploaded %d icon files to CDN.') % uploaded_count,
+                'type': 'success' if uploaded_count else 'warning',
+            }
+        }
+
     # === PUBLIC METHODS FOR URL ACCESS ===
     
     def get_logo_arabic_url(self):
@@ -703,6 +942,27 @@ class AlromaihSystemSettings(models.Model):
                  and including multiple sizes for better browser compatibility
         """
         self.ensure_one()
+        document = self._get_public_settings_document()
+        if document['id'] == self.id:
+            return document['payload']['assets']['website_favicon_html']
+        return self._build_favicon_html_tags()
+    
+    def _build_favicon_html_tags(self):
+        self.ensure_one()
+        
+        # Generated derivatives: one correctly sized file per purpose
+        icon_urls = self._get_icon_derivative_urls()
+        if icon_urls.get('favicon-32'):
+            tags = []
+            if icon_urls.get('favicon-ico'):
+                tags.append(f'<link rel="icon" href="{icon_urls["favicon-ico"]}" sizes="48x48">')
+            tags.append(f'<link rel="icon" type="image/png" sizes="32x32" href="{icon_urls["favicon-32"]}">')
+            if icon_urls.get('favicon-16'):
+                tags.append(f'<link rel="icon" type="image/png" sizes="16x16" href="{icon_urls["favicon-16"]}">')
+            if icon_urls.get('apple-touch-icon'):
+                tags.append(f'<link rel="apple-touch-icon" sizes="180x180" href="{icon_urls["apple-touch-icon"]}">')
+            return '\n'.join(tags)
+        
         favicon_url = self.get_website_favicon_url()
         
         if not favicon_url:
@@ -760,6 +1020,9 @@ class AlromaihSystemSettings(models.Model):
     def get_app_splash_screen_url(self):
         """Get the best available app splash screen URL"""
         self.ensure_one()
+        splash_url = self._get_icon_derivative_urls().get('splash')
+        if splash_url:
+            return splash_url
         return self.app_splash_screen_cdn_url or (f'/web/image/alromaih.system.settings/{self.id}/app_splash_screen' if self.app_splash_screen else False)
     
     def get_copyright_text(self):
@@ -801,14 +1064,22 @@ class AlromaihSystemSettings(models.Model):
     
     def get_all_cdn_urls(self):
         """Get all CDN URLs and app store links for API/website use"""
+        self.ensure_one()
+        document = self._get_public_settings_document()
+        if document['id'] == self.id:
+            return dict(document['payload']['assets'])
+        return self._build_cdn_urls()
+    
+    def _build_cdn_urls(self):
         self.ensure_one()
         return {
             'logo_arabic': self.get_logo_arabic_url(),
             'logo_english': self.get_logo_english_url(),
             'website_favicon': self.get_website_favicon_url(),
-            'website_favicon_html': self.get_favicon_html_tags(),  # HTML link tag for favicon
+            'website_favicon_html': self._build_favicon_html_tags(),  # HTML link tag for favicon
             'app_logo': self.get_app_logo_url(),
             'app_splash_screen': self.get_app_splash_screen_url(),
+            'app_icons': {name: url for name, url in self._get_icon_derivative_urls().items() if name != 'splash'},
             'app_store_url': self.get_app_store_url(),
             'play_store_url': self.get_play_store_url(),
             'copyright_text': self.get_copyright_text(),
@@ -870,6 +1141,11 @@ class AlromaihSystemSettings(models.Model):
                     setattr(self, bunny_path_field, False)
                     deleted_count += 1
         
+        derivative_paths = self._get_icon_derivative_paths()
+        if derivative_paths:
+            deleted_count += sum(1 for path in derivative_paths.values() if self._delete_from_bunny_storage(path))
+            self.icon_derivative_paths = False
+        
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -883,22 +1159,40 @@ class AlromaihSystemSettings(models.Model):
     @api.model
     def get_public_settings_urls(self):
         """Get public URLs for all settings files (useful for API/website)"""
-        settings = self.get_settings()
-        return settings.get_all_cdn_urls()
-
-    # Legacy methods for backward compatibility
-    def get_logo_arabic_url(self):
-        """Get the best available Arabic logo URL (legacy method)"""
-        return self.get_logo_arabic_url()
+        return dict(self._get_public_settings_document()['payload']['assets'])
     
-    def get_logo_english_url(self):
-        """Get the best available English logo URL (legacy method)"""
-        return self.get_logo_english_url()
+    @api.model
+    def get_public_settings(self):
+        """Public settings and asset URLs as served by /api/settings/public"""
+        return json.loads(self._get_public_settings_document()['body'])
     
-    def get_logo_url(self, language='arabic'):
-        """Get the best available logo URL based on language (legacy method)"""
-        return self.get_logo_url(language)
-
+    @api.model
+    @tools.ormcache('self.env.lang')
+    def _get_public_settings_document(self):
+        """Public settings document of the active record, built once per language.
+        
+        The cache is cleared when settings are created or when a write touches one of
+        PUBLIC_DOCUMENT_FIELDS, so storefront renders read settings without touching
+        the database. Returns a dict with the
+        record id, the payload, its JSON body, an ETag and the max-age in seconds.
+        Callers must not mutate the returned structures.
+        """
+        settings = self.sudo().get_settings()
+        values = settings.read(PUBLIC_SETTINGS_FIELDS)[0]
+        values.pop('id', None)
+        payload = {
+            'lang': self.env.lang,
+            'settings': values,
+            'assets': settings._build_cdn_urls(),
+        }
+        body = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return {
+            'id': settings.id,
+            'payload': payload,
+            'body': body,
+            'etag': '"%s"' % hashlib.sha1(body.encode()).hexdigest(),
+            'max_age': max(settings.cache_duration or 0, 0) * 60,
+        }
 
 def post_init_hook(env):
     """Post-install script"""